@@ -0,0 +1 @@
+"""Benchmarks for pydantic-config-builder."""
@@ -0,0 +1,189 @@
+"""Run benchmarks and print timings as JSON.
+
+Usage: python -m benchmarks.run [-w WORKLOAD] [-s SCALE] [-r REPEAT] [-j JOBS] [-o OUTPUT]
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import click
+
+from pydantic_config_builder import __version__
+from pydantic_config_builder.builder import ConfigBuilder, load_yaml, merge_dicts
+from pydantic_config_builder.config import ConfigModel
+from pydantic_config_builder.merge import MergeMemo, branch_points, merge_all
+from pydantic_config_builder.options import BuildOptions
+from pydantic_config_builder.sorting import KeySorter
+from pydantic_config_builder.yaml_backend import HAS_LIBYAML, YamlBackend
+
+from .workloads import WORKLOADS
+
+# Stage state: parsed sources and merged group configurations
+Loaded = Dict[Path, Dict[str, Any]]
+Merged = List[Dict[str, Any]]
+
+
+def _time(func: Callable[[], Any], repeat: int) -> Tuple[Dict[str, Any], Any]:
+    """Time repeated calls of func; returns statistics and the last result."""
+    runs = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        runs.append(time.perf_counter() - start)
+    stats = {
+        "min": min(runs),
+        "median": statistics.median(runs),
+        "mean": statistics.mean(runs),
+        "runs": runs,
+    }
+    return stats, result
+
+
+def _git_commit() -> Optional[str]:
+    """Commit of the working tree, None outside of a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _load(resolved: Dict[Path, List[Path]]) -> Loaded:
+    """Parse every source file that is not an output."""
+    return {
+        path: load_yaml(path)
+        for sources in resolved.values()
+        for path in sources
+        if path not in resolved
+    }
+
+
+def _merge(resolved: Dict[Path, List[Path]], loaded: Loaded) -> Merged:
+    """Merge the sources of every output, reading other outputs from earlier merges."""
+    built: Loaded = {}
+    for out_path, sources in resolved.items():
+        result: Dict[str, Any] = {}
+        for path in sources:
+            result = merge_dicts(result, built[path] if path in built else loaded[path])
+        built[out_path] = result
+    return list(built.values())
+
+
+def _merge_all(resolved: Dict[Path, List[Path]], loaded: Loaded) -> Merged:
+    """Merge like _merge with the single-pass merge_all the builder uses."""
+    built: Loaded = {}
+    for out_path, sources in resolved.items():
+        built[out_path] = merge_all(
+            built[path] if path in built else loaded[path] for path in sources
+        )
+    return list(built.values())
+
+
+def _merge_memo(resolved: Dict[Path, List[Path]], loaded: Loaded) -> Merged:
+    """Merge like _merge_all, reusing merged prefixes shared between outputs."""
+    memo = MergeMemo()
+    built: Loaded = {}
+    checkpoints = branch_points(list(resolved.values()))
+    for (out_path, sources), points in zip(resolved.items(), checkpoints):
+        configs = [built[path] if path in built else loaded[path] for path in sources]
+        built[out_path], _ = memo.merge(configs, points)
+    return list(built.values())
+
+
+def _sort(merged: Merged) -> Merged:
+    """Sort top-level keys naturally, as the builder does before dumping."""
+    sorter = KeySorter()
+    return [sorter.sort(config) for config in merged]
+
+
+def run_workload(name: str, scale: int, repeat: int, jobs: int = 4) -> Dict[str, Any]:
+    """Generate a workload and time each stage of building it, and a build with jobs."""
+    with tempfile.TemporaryDirectory(prefix="pcb-bench-") as tmp:
+        root = Path(tmp)
+        config: ConfigModel = WORKLOADS[name](root, scale)
+        backend = YamlBackend()
+
+        timings: Dict[str, Dict[str, Any]] = {}
+        timings["resolve"], resolved = _time(lambda: config.get_resolved_config(root), repeat)
+        timings["load"], loaded = _time(lambda: _load(resolved), repeat)
+        timings["merge"], merged = _time(lambda: _merge(resolved, loaded), repeat)
+        timings["merge_all"], _ = _time(lambda: _merge_all(resolved, loaded), repeat)
+        timings["merge_memo"], _ = _time(lambda: _merge_memo(resolved, loaded), repeat)
+        timings["sort"], ordered = _time(lambda: _sort(merged), repeat)
+        timings["dump"], dumped = _time(lambda: [backend.dump(c) for c in ordered], repeat)
+        timings["build"], _ = _time(lambda: ConfigBuilder(config, root).build_all(), repeat)
+        timings["build_jobs"], _ = _time(
+            lambda: ConfigBuilder(config, root, options=BuildOptions(jobs=jobs)).build_all(), repeat
+        )
+
+        return {
+            "groups": len(config.builds),
+            "sources": len(loaded),
+            "outputs": len(resolved),
+            "output_bytes": sum(len(data) for data in dumped),
+            "stages": timings,
+        }
+
+
+@click.command()
+@click.option(
+    "-w",
+    "--workload",
+    "workloads",
+    multiple=True,
+    type=click.Choice(list(WORKLOADS)),
+    help="Workload to run (can be specified multiple times, default: all)",
+)
+@click.option("-s", "--scale", type=click.IntRange(min=1), default=1, help="Workload size factor")
+@click.option("-r", "--repeat", type=click.IntRange(min=1), default=5, help="Runs per stage")
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=4,
+    help="Jobs of the build_jobs stage, comparable with the sequential build stage",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write results to this file instead of standard output",
+)
+def main(
+    workloads: Tuple[str, ...], scale: int, repeat: int, jobs: int, output: Optional[Path]
+) -> None:
+    """Time resolving, loading, merging, sorting and dumping of synthetic workloads."""
+    results = {
+        "version": __version__,
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "libyaml": HAS_LIBYAML,
+        "scale": scale,
+        "repeat": repeat,
+        "jobs": jobs,
+        "cpus": os.cpu_count(),
+        "workloads": {
+            name: run_workload(name, scale, repeat, jobs) for name in workloads or WORKLOADS
+        },
+    }
+    text = json.dumps(results, indent=2)
+    if output is None:
+        click.echo(text)
+    else:
+        output.write_text(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
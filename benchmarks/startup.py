@@ -0,0 +1,92 @@
+"""Measure command line startup and print timings as JSON.
+
+Usage: python -m benchmarks.startup [-r REPEAT] [-o OUTPUT]
+"""
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import click
+import yaml
+
+from pydantic_config_builder import __version__
+
+from .run import _git_commit
+from .workloads import many_groups
+
+CLI = [sys.executable, "-m", "pydantic_config_builder.cli"]
+
+# Commands run from the checkout so the package is found without installing it
+CHECKOUT = Path(__file__).parent.parent
+
+
+def _time_command(command: List[str], repeat: int) -> Dict[str, Any]:
+    """Time runs of a command."""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=CHECKOUT, check=True, capture_output=True)
+        runs.append(time.perf_counter() - start)
+    return {"min": min(runs), "median": sorted(runs)[len(runs) // 2], "runs": runs}
+
+
+def _imported_modules(args: List[str]) -> List[str]:
+    """Top-level packages imported by a run of the command line."""
+    command = [sys.executable, "-X", "importtime", *CLI[1:], *args]
+    result = subprocess.run(command, cwd=CHECKOUT, capture_output=True, text=True)
+    names = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            name = line.rsplit("|", 1)[1].strip()
+            if name != "imported package":
+                names.add(name.split(".")[0])
+    return sorted(names)
+
+
+@click.command()
+@click.option("-r", "--repeat", type=click.IntRange(min=1), default=10, help="Runs per command")
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write results to this file instead of standard output",
+)
+def main(repeat: int, output: Optional[Path]) -> None:
+    """Time --help and an incremental build with everything up to date."""
+    with tempfile.TemporaryDirectory(prefix="pcb-startup-") as tmp:
+        root = Path(tmp)
+        config = many_groups(root, 1)
+        config_path = root / "pydantic-config-builder.yaml"
+        config_path.write_text(yaml.safe_dump(config.model_dump()["builds"], sort_keys=False))
+        noop = ["-c", str(config_path), "--incremental"]
+        subprocess.run([*CLI, *noop], cwd=CHECKOUT, check=True, capture_output=True)
+        results = {
+            "version": __version__,
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "repeat": repeat,
+            "commands": {
+                # Interpreter startup alone, the floor for the others
+                "python": _time_command([sys.executable, "-c", "pass"], repeat),
+                "help": _time_command([*CLI, "-h"], repeat),
+                "noop": _time_command([*CLI, *noop], repeat),
+            },
+            # Heavy packages --help should not import
+            "help_heavy_imports": [
+                name for name in _imported_modules(["-h"]) if name in ("pydantic", "yaml")
+            ],
+        }
+    text = json.dumps(results, indent=2)
+    if output is None:
+        click.echo(text)
+    else:
+        output.write_text(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Synthetic configuration trees for benchmarks."""
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import yaml
+
+from pydantic_config_builder.config import BuildConfig, ConfigModel
+
+# Workload generator: (directory, scale) -> configuration model
+Workload = Callable[[Path, int], ConfigModel]
+
+
+def _write(path: Path, data: Dict[str, Any]) -> None:
+    """Write a YAML file, creating parent directories."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(yaml.safe_dump(data, sort_keys=False))
+
+
+def _settings(prefix: str, count: int) -> Dict[str, Any]:
+    """Flat mapping of mixed scalar values."""
+    return {
+        f"{prefix}_{i}": i if i % 3 == 0 else f"value {i}" if i % 3 == 1 else [i, i + 1]
+        for i in range(count)
+    }
+
+
+def _nested(depth: int, width: int, leaf: str) -> Dict[str, Any]:
+    """Mapping nested depth levels deep with width keys per level."""
+    node: Dict[str, Any] = {f"leaf{i}": f"{leaf} {i}" for i in range(width)}
+    for level in range(depth):
+        node = {f"level{level}": node, **{f"key{level}_{i}": i for i in range(width)}}
+    return node
+
+
+def many_groups(root: Path, scale: int) -> ConfigModel:
+    """Many small groups sharing a base file."""
+    _write(root / "base.yaml", {"service": _settings("base", 50)})
+    builds = {}
+    for i in range(100 * scale):
+        _write(root / "groups" / f"group{i}.yaml", {"service": _settings(f"g{i}", 10)})
+        builds[f"group{i}"] = BuildConfig(
+            input=["base.yaml", f"groups/group{i}.yaml"], output=[f"out/group{i}.yaml"]
+        )
+    return ConfigModel(builds=builds)
+
+
+def deep_nesting(root: Path, scale: int) -> ConfigModel:
+    """Deeply nested mappings overridden at every level."""
+    builds = {}
+    for i in range(10 * scale):
+        inputs = []
+        for layer in range(5):
+            name = f"deep/group{i}/layer{layer}.yaml"
+            _write(root / name, _nested(30, 3, f"layer {layer}"))
+            inputs.append(name)
+        builds[f"deep{i}"] = BuildConfig(input=inputs, output=[f"out/deep{i}.yaml"])
+    return ConfigModel(builds=builds)
+
+
+def large_files(root: Path, scale: int) -> ConfigModel:
+    """Few groups merging large files."""
+    builds = {}
+    for i in range(2 * scale):
+        inputs = []
+        for part in range(3):
+            name = f"large/group{i}/part{part}.yaml"
+            data = {f"section{s}": _settings(f"p{part}", 200) for s in range(25)}
+            data.update(_settings(f"top{part % 2}", 1000))
+            _write(root / name, data)
+            inputs.append(name)
+        builds[f"large{i}"] = BuildConfig(input=inputs, output=[f"out/large{i}.yaml"])
+    return ConfigModel(builds=builds)
+
+
+def wide_globs(root: Path, scale: int) -> ConfigModel:
+    """Many groups matching overlapping recursive globs over a wide tree."""
+    for d in range(20 * scale):
+        for f in range(20):
+            _write(root / "tree" / f"dir{d}" / f"sub{f % 4}" / f"file{f}.yaml", {f"k{d}_{f}": f})
+    builds = {
+        f"glob{i}": BuildConfig(
+            input=["tree/**/*.yaml", f"tree/dir{i}/*/file1?.yaml"], output=[f"out/glob{i}.yaml"]
+        )
+        for i in range(20 * scale)
+    }
+    return ConfigModel(builds=builds)
+
+
+def long_chain(root: Path, scale: int) -> ConfigModel:
+    """Chain of groups each reading the previous group's output."""
+    builds = {}
+    for i in range(50 * scale):
+        name = f"chain/step{i}.yaml"
+        _write(root / name, {"step": i, "settings": _settings(f"s{i}", 5)})
+        inputs = [name] if i == 0 else [f"out/chain{i - 1}.yaml", name]
+        builds[f"chain{i}"] = BuildConfig(input=inputs, output=[f"out/chain{i}.yaml"])
+    return ConfigModel(builds=builds)
+
+
+def wide_keys(root: Path, scale: int) -> ConfigModel:
+    """Groups overriding a flat file with many top-level keys, like feature flags."""
+    _write(root / "flags.yaml", {f"flag_{i}": i % 2 == 0 for i in range(10_000 * scale)})
+    builds = {}
+    for i in range(3):
+        name = f"flags/env{i}.yaml"
+        _write(root / name, {f"flag_{j}": True for j in range(i, 1000 * scale, 3)})
+        builds[f"env{i}"] = BuildConfig(input=["flags.yaml", name], output=[f"out/env{i}.yaml"])
+    return ConfigModel(builds=builds)
+
+
+WORKLOADS: Dict[str, Workload] = {
+    "many_groups": many_groups,
+    "deep_nesting": deep_nesting,
+    "large_files": large_files,
+    "wide_globs": wide_globs,
+    "long_chain": long_chain,
+    "wide_keys": wide_keys,
+}
+
+
+def workload_names() -> List[str]:
+    """Names of all workloads."""
+    return list(WORKLOADS)
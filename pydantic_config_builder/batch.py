@@ -0,0 +1,108 @@
+"""Building several configurations in one process."""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, List, Mapping, Optional, TypeVar
+
+from .builder import ConfigBuilder
+
+CONFIG_FILE_NAMES = ("pydantic-config-builder.yaml", "pydantic-config-builder.yml")
+
+T = TypeVar("T")
+
+
+class ConfigBuildError(Exception):
+    """Raised when building one of several configurations fails."""
+
+    def __init__(self, config_path: Path, error: Exception):
+        """Initialize error for the configuration file that failed to build."""
+        super().__init__(f"{config_path}: {error}")
+        self.config_path = config_path
+        self.error = error
+
+
+def discover_configs(root: Path) -> List[Path]:
+    """Find configuration files in a directory tree, skipping hidden directories.
+
+    A directory with both a .yaml and a .yml file contributes the .yaml one,
+    like the default configuration lookup.
+    """
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for name in CONFIG_FILE_NAMES:
+            if name in filenames:
+                found.append(Path(dirpath) / name)
+                break
+    return found
+
+
+def build_configs(
+    builders: Mapping[Path, ConfigBuilder],
+    jobs: int = 1,
+    groups: Optional[Iterable[str]] = None,
+) -> None:
+    """Build several configurations, keyed by their configuration file.
+
+    Builders created with a shared source cache and glob index parse shared
+    files and list shared directories once. With jobs greater than one, up to
+    that many configurations are built at once, so they must not read each
+    other's outputs. Otherwise they are built in the given order, and the
+    shared index forgets the directories a build wrote to, so later
+    configurations see its outputs.
+
+    With groups given, only those groups are written; configurations without
+    any of them write nothing.
+    """
+    selected = None if groups is None else list(groups)
+
+    def build(config_path: Path) -> None:
+        builder = builders[config_path]
+        try:
+            if selected is None:
+                builder.build_all()
+            else:
+                builder.build_all([name for name in selected if name in builder.plan.groups])
+        except Exception as err:
+            raise ConfigBuildError(config_path, err) from err
+        if builder.glob_index is not None and jobs == 1:
+            builder.glob_index.invalidate(str(p) for p in builder.written_outputs)
+
+    _for_each(builders, jobs, build)
+
+
+def check_configs(
+    builders: Mapping[Path, ConfigBuilder],
+    jobs: int = 1,
+    groups: Optional[Iterable[str]] = None,
+) -> List[Path]:
+    """Find stale outputs of several configurations without writing anything.
+
+    See ConfigBuilder.check; configurations are checked like build_configs
+    builds them. Returns the stale outputs of all configurations in order.
+    """
+    selected = None if groups is None else list(groups)
+
+    def check(config_path: Path) -> List[Path]:
+        builder = builders[config_path]
+        try:
+            if selected is None:
+                return builder.check()
+            return builder.check([name for name in selected if name in builder.plan.groups])
+        except Exception as err:
+            raise ConfigBuildError(config_path, err) from err
+
+    return [path for stale in _for_each(builders, jobs, check) for path in stale]
+
+
+def _for_each(
+    builders: Mapping[Path, ConfigBuilder], jobs: int, task: Callable[[Path], T]
+) -> List[T]:
+    """Run task for each configuration file, up to jobs at once; results are in order."""
+    if jobs == 1 or len(builders) == 1:
+        return [task(config_path) for config_path in builders]
+    with ThreadPoolExecutor(
+        max_workers=jobs, thread_name_prefix="pydantic-config-builder-config"
+    ) as executor:
+        # Collecting the results re-raises the first error
+        return list(executor.map(task, builders))
@@ -1,28 +1,52 @@
 """YAML configuration builder."""
-import re
+import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Any, Dict, List
-
-import yaml
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
+from . import __version__
+from .cache import SourceCache
 from .config import ConfigModel
+from .globindex import GlobIndex
+from .incremental import CACHE_DIR_NAME, MANIFEST_FILE_NAME, BuildManifest, hash_bytes, hash_file
+from .merge import MergeMemo, branch_points
+from .options import BuildOptions
+from .pipeline import IOPipeline
+from .plan import BuildPlan, CircularDependencyError
+from .processes import parse, process_pool, serialize
+from .profiling import Profiler, Span
+from .scheduler import run_in_dependency_order, topological_order
+from .sorting import KeySorter, natural_sort_key  # noqa: F401
+from .writer import (
+    has_chunks,
+    has_content,
+    read_chunks,
+    write_if_changed,
+    write_stream_if_changed,
+)
+from .yaml_backend import YamlBackend
 
-
-def natural_sort_key(key: str) -> List[Any]:
-    """Convert string into list of string and number chunks for natural sorting.
-    Temporarily appends .yaml to the key for sorting purposes."""
-    key_with_yaml = f"{key}.yaml"
-
-    def convert(text: str) -> Any:
-        return int(text) if text.isdigit() else text.lower()
-
-    return [convert(c) for c in re.split("([0-9]+)", key_with_yaml)]
+# Smallest YAML, in bytes, worth parsing or dumping in a worker process;
+# smaller files take less time than the round trip to a worker
+MIN_PROCESS_BYTES = 64 * 1024
 
 
 def load_yaml(file_path: Path) -> Dict[str, Any]:
     """Load YAML file."""
-    with open(file_path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    return YamlBackend().load(file_path)
 
 
 def merge_dicts(base: Dict[str, Any], overlay: Dict[str, Any]) -> Dict[str, Any]:
@@ -39,59 +63,638 @@ def merge_dicts(base: Dict[str, Any], overlay: Dict[str, Any]) -> Dict[str, Any]
 class ConfigBuilder:
     """Configuration builder."""
 
-    def __init__(self, config: ConfigModel, base_dir: Path, verbose: bool = False):
-        """Initialize builder."""
+    def __init__(
+        self,
+        config: ConfigModel,
+        base_dir: Path,
+        verbose: bool = False,
+        options: Optional[BuildOptions] = None,
+        profiler: Optional[Profiler] = None,
+        groups: Optional[Iterable[str]] = None,
+        source_cache: Optional[SourceCache] = None,
+        glob_index: Optional[GlobIndex] = None,
+    ):
+        """Initialize builder.
+
+        With groups given, only those groups and the groups whose outputs
+        they read are resolved and built. A source_cache or glob_index given
+        is shared with other builders, so files and directories used by
+        several configurations are parsed and listed once.
+        """
         self.config = config
         self.base_dir = base_dir
         self.verbose = verbose
+        self.options = BuildOptions() if options is None else options
+        self.profiler = profiler
+        self.groups = None if groups is None else list(groups)
         self.built_configs: Dict[Path, Dict[str, Any]] = {}
+        self.yaml = YamlBackend(self.options.yaml_backend)
+        self.sorter = KeySorter(self.options.sort_keys)
+        if source_cache is None:
+            source_cache = SourceCache(self._load_source, self.options.memory_budget)
+        self.source_cache = source_cache
+        self.merge_memo = MergeMemo()
+        self.glob_index = glob_index
+        self.rebuilt_outputs: List[Path] = []
+        self.skipped_outputs: List[Path] = []
+        self.written_outputs: List[Path] = []
+        self.unchanged_outputs: List[Path] = []
+        self._plan: Optional[BuildPlan] = None
+        self._group_digests: Dict[str, str] = {}
+        self._checkpoints: Optional[Dict[str, List[int]]] = None
+        # Groups reading each group's outputs that have not been merged yet
+        self._consumers: Dict[str, int] = {}
+        self._unmerged: Set[str] = set()
+        self._finished: Set[str] = set()
+        self._lock = threading.Lock()
+        self._group_locks: Dict[str, threading.RLock] = {}
+        self._io: Optional[IOPipeline] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def plan(self) -> BuildPlan:
+        """Resolved build plan, computed on first use and reused afterwards."""
+        if self._plan is None:
+            with self._phase("resolve"):
+                self._plan = BuildPlan.from_config(
+                    self.config, self.base_dir, self.glob_index, self.groups
+                )
+        return self._plan
+
+    def _phase(self, phase: str, name: str = "") -> ContextManager[Span]:
+        """Time a build phase if profiling."""
+        if self.profiler is None:
+            return nullcontext(Span())
+        return self.profiler.phase(phase, name)
+
+    def _load_source(self, path: Path) -> Dict[str, Any]:
+        """Parse a source file."""
+        if self.profiler is None:
+            return self._parse(path)
+        with self.profiler.phase("parse", str(path)) as span:
+            span.nbytes = path.stat().st_size
+            return self._parse(path)
+
+    def _parse(self, path: Path) -> Dict[str, Any]:
+        """Parse a YAML file, in a worker process during a build with jobs."""
+        processes = self._processes
+        if processes is None or path.stat().st_size < MIN_PROCESS_BYTES:
+            return self.yaml.load(path)
+        return processes.submit(parse, self.yaml.name, path).result()
+
+    def _source_bytes(self, name: str) -> int:
+        """Total size of the existing source files of a group."""
+        total = 0
+        for path in self.plan.groups[name].sources:
+            try:
+                total += path.stat().st_size
+            except FileNotFoundError:
+                pass
+        return total
+
+    def invalidate_plan(self) -> None:
+        """Discard the resolved build plan so it is recomputed on next use.
+
+        Call this after changing the configuration or when files matched by
+        glob patterns have been added or removed.
+        """
+        self._plan = None
+        self._group_digests.clear()
+        self._checkpoints = None
+        self.merge_memo.clear()
+
+    def invalidate_groups(self, names: Iterable[str]) -> List[str]:
+        """Forget built configurations of groups and of every group depending on them.
+
+        Returns the invalidated groups in dependency order.
+        """
+        invalidated = self.plan.with_dependents(names)
+        for name in invalidated:
+            for out_path in self.plan.groups[name].outputs:
+                self.built_configs.pop(out_path, None)
+        # Memoized merges keep the sources they were built from alive
+        self.merge_memo.clear()
+        return invalidated
+
+    def group_digest(self, name: str, manifest: BuildManifest) -> str:
+        """Get a digest of everything the outputs of a group are built from.
+
+        The digest covers the tool version, the key sort mode, the group
+        definition and, in order, every resolved source path with either its
+        content hash or, for outputs of other groups, the digest of that group.
+        """
+        if name in self._group_digests:
+            return self._group_digests[name]
+
+        plan = self.plan
+        digest = hashlib.sha256()
+        digest.update(__version__.encode())
+        digest.update(self.sorter.mode.encode())
+        digest.update(self.config.builds[name].model_dump_json().encode())
+        for src_file in plan.groups[name].sources:
+            digest.update(b"\0" + str(src_file).encode() + b"\0")
+            if src_file in plan.output_groups:
+                digest.update(self.group_digest(plan.output_groups[src_file], manifest).encode())
+            elif src_file.exists():
+                digest.update(manifest.file_hash(src_file).encode())
+
+        self._group_digests[name] = digest.hexdigest()
+        return self._group_digests[name]
 
     def build_config(self, output_path: Path, source_files: List[Path]) -> Dict[str, Any]:
-        """Build configuration by merging source files."""
+        """Build configuration by merging source files.
+
+        The result may share nested values with other built configurations
+        and with the source cache, so it must not be modified in place.
+        """
         if output_path in self.built_configs:
             if self.verbose:
                 print(f"Using cached config for {output_path}")
             return self.built_configs[output_path]
 
+        # Fail on circular dependencies instead of recursing without end
+        cycle = self.plan.find_cycle()
+        if cycle is not None:
+            raise CircularDependencyError(cycle)
+
+        group_name = self.plan.output_groups.get(output_path)
+        if group_name is None:
+            return self._merge_sources(output_path, source_files)
+
+        # Threads needing the same group output wait for a single build of it
+        with self._lock:
+            group_lock = self._group_locks.setdefault(group_name, threading.RLock())
+        with group_lock:
+            if output_path in self.built_configs:
+                return self.built_configs[output_path]
+            return self._merge_sources(output_path, source_files)
+
+    def _merge_sources(self, output_path: Path, source_files: List[Path]) -> Dict[str, Any]:
+        """Merge source files and remember the result for output_path."""
         if self.verbose:
             print(f"Building config for {output_path}")
             print(f"Source files: {source_files}")
 
-        result: Dict[str, Any] = {}
+        group_name = self.plan.output_groups.get(output_path)
+        src_configs = self._load_sources(source_files)
+        with self._phase("merge", group_name or str(output_path)):
+            result = self._merge(group_name, source_files, src_configs)
+        if group_name is not None and self.plan.groups[group_name].sources == source_files:
+            self._merged(group_name)
+        self.built_configs[output_path] = result
+        # Other outputs of the same group share the result
+        if output_path in self.plan.output_groups:
+            group = self.plan.group_for_output(output_path)
+            if group.sources == source_files:
+                for path in group.outputs:
+                    self.built_configs[path] = result
+        return result
+
+    def _merge(
+        self, name: Optional[str], source_files: List[Path], src_configs: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Merge loaded sources, reusing merged prefixes shared with other groups."""
+        checkpoints: List[int] = []
+        if (
+            self.options.memory_budget is None
+            and name is not None
+            and self.plan.groups[name].sources == source_files
+        ):
+            checkpoints = self._merge_checkpoints(name)
+        result, reused = self.merge_memo.merge(src_configs, checkpoints)
+        if reused and self.profiler is not None:
+            self.profiler.count("merge_prefix_hits")
+            self.profiler.count("merge_inputs_reused", reused)
+        return result
+
+    def _merge_checkpoints(self, name: str) -> List[int]:
+        """Prefix lengths of a group's sources whose merge results other groups can reuse."""
+        if self._checkpoints is None:
+            groups = self.plan.groups
+            points = branch_points([group.sources for group in groups.values()])
+            self._checkpoints = dict(zip(groups, points))
+        return self._checkpoints[name]
+
+    def _track_releases(self, merging: List[str], run: Iterable[str]) -> None:
+        """Count the groups of a build reading each group's outputs.
+
+        merging are the groups the build merges and run those it writes.
+        """
+        with self._lock:
+            self._consumers = {name: 0 for name in merging}
+            for name in merging:
+                for dependency in self.plan.dependencies[name]:
+                    self._consumers[dependency] += 1
+            self._unmerged = set(merging)
+            # Groups only built as inputs of others have nothing left to write
+            self._finished = set(merging) - set(run)
+
+    def _merged(self, name: str) -> None:
+        """Note that a group has read its dependencies, releasing those no other group needs."""
+        with self._lock:
+            if name not in self._unmerged:
+                return
+            self._unmerged.discard(name)
+            for dependency in self.plan.dependencies[name]:
+                self._consumers[dependency] -= 1
+                self._release_if_unused(dependency)
+
+    def _finish(self, name: str) -> None:
+        """Note that a group's outputs are written, releasing them if no group reads them."""
+        with self._lock:
+            self._finished.add(name)
+            self._release_if_unused(name)
+
+    def _release_if_unused(self, name: str) -> None:
+        """Forget the built configuration of a finished group nobody reads anymore."""
+        if name in self._finished and self._consumers.get(name) == 0:
+            del self._consumers[name]
+            for out_path in self.plan.groups[name].outputs:
+                self.built_configs.pop(out_path, None)
+
+    def _load_sources(self, source_files: List[Path]) -> List[Dict[str, Any]]:
+        """Load source files, building those that are outputs of other groups."""
+        output_sources = self.plan.output_sources
+        src_configs: List[Dict[str, Any]] = []
         for src_file in source_files:
-            if not src_file.exists():
+            # If the source file is an output file, build it first
+            if src_file in output_sources:
+                src_config = self.build_config(src_file, output_sources[src_file])
+            elif not src_file.exists():
                 raise FileNotFoundError(f"Source file not found: {src_file}")
+            else:
+                src_config = self.source_cache.load(src_file)
+            src_configs.append(src_config)
+        return src_configs
 
-            # If the source file is an output file, build it first
-            if src_file in self.config.get_resolved_config(self.base_dir):
-                src_config = self.build_config(
-                    src_file, self.config.get_resolved_config(self.base_dir)[src_file]
-                )
+    def build_group(self, name: str) -> Dict[str, Any]:
+        """Build the configuration of a group in memory, without writing anything.
+
+        Parsed sources and built configurations are cached and shared with
+        build_all, so the result must not be modified in place; copy it with
+        copy.deepcopy first if needed. Raises KeyError for unknown groups.
+        """
+        group = self.plan.groups.get(name)
+        if group is None:
+            raise KeyError(f"Unknown group: {name}")
+        if group.outputs:
+            return self.build_config(group.outputs[0], group.sources)
+        # Every output of this group is written by a later group, so there is nothing to cache
+        return self._merge(name, group.sources, self._load_sources(group.sources))
+
+    def _selected_groups(self, groups: Optional[Iterable[str]]) -> List[str]:
+        """Groups in dependency order, all of them or only the given ones."""
+        if groups is None:
+            return self.plan.order
+        selected = set(groups)
+        unknown = selected - set(self.plan.groups)
+        if unknown:
+            raise KeyError(f"Unknown groups: {', '.join(sorted(unknown))}")
+        return [name for name in self.plan.order if name in selected]
+
+    def iter_outputs(
+        self, groups: Optional[Iterable[str]] = None
+    ) -> Iterator[Tuple[Path, Dict[str, Any]]]:
+        """Build groups in memory and yield each output path with its configuration.
+
+        Outputs come in dependency order; nothing is serialized or written.
+        The configurations must not be modified in place, as for build_group.
+        """
+        for name in self._selected_groups(groups):
+            group = self.plan.groups[name]
+            if group.outputs:
+                config = self.build_group(name)
+                for out_path in group.outputs:
+                    yield out_path, config
+
+    def check(self, groups: Optional[Iterable[str]] = None) -> List[Path]:
+        """Find outputs whose content differs from what build_all would write.
+
+        Nothing is written. Missing outputs are reported without building
+        them; other outputs are built in memory and compared with their file,
+        sizes first. With options.incremental, outputs the manifest records
+        as built from unchanged inputs are trusted without building them.
+
+        Returns the stale outputs in configuration order. Raises KeyError for
+        unknown groups.
+        """
+        names = self._selected_groups(groups)
+        self._group_digests.clear()
+        manifest = None
+        if self.options.incremental and not self.options.force:
+            manifest = BuildManifest.load(self.base_dir / CACHE_DIR_NAME / MANIFEST_FILE_NAME)
+            # Compute digests up front so worker threads only read them
+            for name in topological_order(self.plan):
+                self.group_digest(name, manifest)
+
+        stale: List[Path] = []
+
+        def check_group(name: str) -> None:
+            group = self.plan.groups[name]
+            out_paths = group.outputs
+            if manifest is not None:
+                digest = self.group_digest(name, manifest)
+                out_paths = [p for p in out_paths if not manifest.is_up_to_date(p, digest)]
+            # Missing outputs are stale without building anything
+            found = [p for p in out_paths if p.exists()]
+            group_stale = [p for p in out_paths if p not in found]
+            if found:
+                config = self.build_config(group.outputs[0], group.sources)
+                if self.options.stream:
+                    # Serialize once, comparing the first output while streaming and
+                    # the others with the hash of the whole stream
+                    content = hashlib.sha256()
+                    chunks = self._observe(self.serialize_chunks(config, name), content.update)
+                    first, others = found[0], found[1:]
+                    if not has_chunks(first, chunks):
+                        group_stale.append(first)
+                    if others:
+                        for _ in chunks:
+                            pass
+                        digest = content.hexdigest()
+                        group_stale += [p for p in others if hash_file(p) != digest]
+                else:
+                    data = self.serialize(config, name)
+                    group_stale += [p for p in found if not has_content(p, data)]
+            with self._lock:
+                stale.extend(group_stale)
+
+        self._processes = process_pool(self.options.jobs) if self.options.jobs > 1 else None
+        try:
+            run_in_dependency_order(self.plan, check_group, self.options.jobs, set(names))
+        finally:
+            if self._processes is not None:
+                self._processes.shutdown()
+                self._processes = None
+        position = {path: i for i, path in enumerate(self.plan.output_groups)}
+        return sorted(stale, key=position.__getitem__)
+
+    def iter_serialized(
+        self, groups: Optional[Iterable[str]] = None
+    ) -> Iterator[Tuple[Path, bytes]]:
+        """Build groups in memory and yield each output path with the YAML build_all would write.
+
+        Each group is serialized once; nothing is written.
+        """
+        for name in self._selected_groups(groups):
+            group = self.plan.groups[name]
+            if group.outputs:
+                data = self.serialize(self.build_group(name), name)
+                for out_path in group.outputs:
+                    yield out_path, data
+
+    def serialize(self, config: Dict[str, Any], name: str = "") -> bytes:
+        """Serialize a built configuration to YAML; name labels profiled phases."""
+        processes = self._processes
+        if processes is not None and name and self._source_bytes(name) >= MIN_PROCESS_BYTES:
+            # Only the serialized bytes come back; sorting is timed as part of dump
+            with self._phase("dump", name):
+                return processes.submit(
+                    serialize, self.yaml.name, self.sorter.mode, config
+                ).result()
+        with self._phase("sort", name):
+            sorted_result = self.sorter.sort(config)
+        with self._phase("dump", name):
+            return self.yaml.dump(sorted_result)
+
+    def serialize_chunks(self, config: Dict[str, Any], name: str = "") -> Iterator[bytes]:
+        """Serialize a built configuration to YAML one top-level key at a time.
+
+        The chunks joined are identical to serialize(config).
+        """
+        with self._phase("sort", name):
+            if self.sorter.mode == "recursive":
+                config = self.sorter.sort(config)
+                keys = list(config)
             else:
-                src_config = load_yaml(src_file)
+                keys = self.sorter.keys(config)
+        yield from self.yaml.dump_items(config, keys)
 
-            result = merge_dicts(result, src_config)
+    def _build_group_outputs(self, name: str, manifest: Optional[BuildManifest]) -> None:
+        """Build a group and write its outputs that are not up to date."""
+        group = self.plan.groups[name]
+        out_paths = group.outputs
+        if not out_paths:
+            return
 
-        self.built_configs[output_path] = result
-        return result
+        digest = None
+        if manifest is not None:
+            digest = self.group_digest(name, manifest)
+            if not self.options.force:
+                out_paths = []
+                for out_path in group.outputs:
+                    if manifest.is_up_to_date(out_path, digest):
+                        if self.verbose:
+                            print(f"\nSkipping up-to-date {out_path}")
+                        self.skipped_outputs.append(out_path)
+                    else:
+                        out_paths.append(out_path)
+                if not out_paths:
+                    return
 
-    def build_all(self) -> None:
-        """Build all configurations."""
-        resolved_config = self.config.get_resolved_config(self.base_dir)
-        for out_path, src_files in resolved_config.items():
-            if self.verbose:
-                print(f"\nProcessing {out_path}")
+        if self.verbose:
+            print(f"\nProcessing group {name}")
+
+        result = self.build_config(group.outputs[0], group.sources)
+        if self._io is not None:
+            self._io.submit_write(
+                lambda: self._write_outputs(name, result, out_paths, manifest, digest)
+            )
+        else:
+            self._write_outputs(name, result, out_paths, manifest, digest)
+
+    def _write_outputs(
+        self,
+        name: str,
+        result: Dict[str, Any],
+        out_paths: List[Path],
+        manifest: Optional[BuildManifest],
+        digest: Optional[str],
+    ) -> None:
+        """Serialize a built group and write it to the given outputs."""
+        if self.options.stream:
+            content = hashlib.sha256()
+            first_path: Optional[Path] = None
+        else:
+            # Serialize once, then write the same bytes to every output
+            data = self.serialize(result, name)
+            content_hash = hash_bytes(data)
+
+        for out_path in out_paths:
+            # Write the result unless the file already has the same content
+            with self._phase("write", name) as span:
+                if not self.options.stream:
+                    written = write_if_changed(out_path, data)
+                    span.nbytes = len(data) if written else 0
+                else:
+                    # Serialize while writing the first output and copy it to the others
+                    if first_path is None:
+                        chunks = self._observe(self.serialize_chunks(result, name), content.update)
+                    else:
+                        chunks = read_chunks(first_path)
+                    written = write_stream_if_changed(out_path, chunks)
+                    span.nbytes = out_path.stat().st_size if written else 0
+                    if first_path is None:
+                        first_path = out_path
+                        content_hash = content.hexdigest()
+            if written:
+                if self.verbose:
+                    print(f"Wrote {out_path}")
+                self.written_outputs.append(out_path)
+            else:
+                if self.verbose:
+                    print(f"Output unchanged: {out_path}")
+                self.unchanged_outputs.append(out_path)
+            self.rebuilt_outputs.append(out_path)
 
-            result = self.build_config(out_path, src_files)
+            if manifest is not None and digest is not None:
+                manifest.record(out_path, digest, content_hash)
 
-            # Create parent directory if it doesn't exist
-            out_path.parent.mkdir(parents=True, exist_ok=True)
+    @staticmethod
+    def _observe(chunks: Iterable[bytes], callback: Callable[[bytes], None]) -> Iterator[bytes]:
+        """Pass chunks through, calling callback with each of them."""
+        for chunk in chunks:
+            callback(chunk)
+            yield chunk
+
+    def _source_files(self, names: Iterable[str]) -> List[Path]:
+        """Source files of groups that are not outputs of other groups."""
+        output_paths = self.plan.output_paths
+        files = {
+            path: None
+            for name in names
+            for path in self.plan.groups[name].sources
+            if path not in output_paths
+        }
+        return list(files)
+
+    def _prefetch_source(self, path: Path) -> None:
+        """Load a source into the cache ahead of the build, unless the cache is full.
+
+        Returns nothing, so pending prefetches do not keep parsed sources alive
+        beyond a memory budget, and stops once the cache is full rather than
+        evicting sources the build has yet to read.
+        """
+        cache = self.source_cache
+        if cache.max_bytes is None or cache.nbytes < cache.max_bytes:
+            cache.load(path)
+
+    def _groups_to_build(
+        self, selected: Optional[Iterable[str]], manifest: Optional[BuildManifest]
+    ) -> List[str]:
+        """Groups whose sources a build reads: groups with stale outputs and their dependencies."""
+        names = (
+            self.plan.order if selected is None else [n for n in self.plan.order if n in selected]
+        )
+        if manifest is not None and not self.options.force:
+            names = [
+                name
+                for name in names
+                if not all(
+                    manifest.is_up_to_date(path, self.group_digest(name, manifest))
+                    for path in self.plan.groups[name].outputs
+                )
+            ]
+        needed = set()
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            if name not in needed:
+                needed.add(name)
+                pending.extend(self.plan.dependencies[name])
+        return [name for name in self.plan.order if name in needed]
 
-            # Sort top-level keys naturally while preserving nested order
-            sorted_result = {
-                key: result[key] for key in sorted(result.keys(), key=natural_sort_key)
-            }
+    def build_all(self, groups: Optional[Iterable[str]] = None) -> None:
+        """Build all configurations, or only those of the given groups.
 
-            # Write the result
-            with open(out_path, "w", encoding="utf-8") as f:
-                yaml.dump(sorted_result, f, sort_keys=False, allow_unicode=True, width=float("inf"))
+        Groups are built after the groups whose outputs they read, and each
+        group's outputs are written as soon as it has been built. The options
+        change how, not what, is written:
+
+        - incremental skips outputs the manifest in the cache directory
+          records as built from unchanged inputs, unless force is set.
+        - jobs builds that many independent groups at once, parsing and
+          serializing large files in as many worker processes.
+        - io_concurrency reads sources ahead of the groups using them and
+          writes outputs behind the build, that many files at once.
+        - stream serializes and writes outputs one top-level key at a time.
+        - memory_budget bounds the source cache and releases each built
+          configuration once every group reading it has been merged; merged
+          prefixes are not memoized then, as they keep their inputs alive.
+        """
+        selected = None if groups is None else set(groups)
+        self._group_digests.clear()
+        self.merge_memo.clear()
+        self.rebuilt_outputs = []
+        self.skipped_outputs = []
+        self.written_outputs = []
+        self.unchanged_outputs = []
+
+        pipeline = (
+            IOPipeline(self.options.io_concurrency) if self.options.io_concurrency > 1 else None
+        )
+        self._processes = process_pool(self.options.jobs) if self.options.jobs > 1 else None
+        try:
+            manifest = None
+            if self.options.incremental:
+                manifest = BuildManifest.load(self.base_dir / CACHE_DIR_NAME / MANIFEST_FILE_NAME)
+                if pipeline is not None:
+                    pipeline.prefetch(self._source_files(self.plan.order), manifest.file_hash)
+                    pipeline.wait_prefetched()
+                # Compute digests up front so worker threads only read them
+                for name in topological_order(self.plan):
+                    self.group_digest(name, manifest)
+
+            if pipeline is not None or self.options.memory_budget is not None:
+                merging = self._groups_to_build(selected, manifest)
+            if pipeline is not None:
+                self._io = pipeline
+                pipeline.prefetch(self._source_files(merging), self._prefetch_source)
+            if self.options.memory_budget is not None:
+                self._track_releases(merging, self.plan.order if selected is None else selected)
+
+            def build_group_outputs(name: str) -> None:
+                self._build_group_outputs(name, manifest)
+                if self.options.memory_budget is not None:
+                    self._finish(name)
+
+            run_in_dependency_order(self.plan, build_group_outputs, self.options.jobs, selected)
+            if pipeline is not None:
+                pipeline.wait()
+        finally:
+            self._consumers = {}
+            self._unmerged = set()
+            self._finished = set()
+            if pipeline is not None:
+                self._io = None
+                pipeline.close()
+            if self._processes is not None:
+                self._processes.shutdown()
+                self._processes = None
+
+        # Report outputs in configuration order whatever order they finished in
+        position = {path: i for i, path in enumerate(self.plan.output_groups)}
+        for outputs in (
+            self.rebuilt_outputs,
+            self.skipped_outputs,
+            self.written_outputs,
+            self.unchanged_outputs,
+        ):
+            outputs.sort(key=position.__getitem__)
+
+        if manifest is not None:
+            manifest.save()
+
+        if self.verbose:
+            print(
+                f"\nWrote {len(self.written_outputs)} outputs, "
+                f"{len(self.unchanged_outputs)} unchanged"
+            )
+            print(
+                f"Source cache: {self.source_cache.hits} hits, "
+                f"{self.source_cache.misses} misses, {self.source_cache.evictions} evictions"
+            )
+            print(
+                f"Merge memo: {self.merge_memo.hits} shared prefixes reused, "
+                f"{self.merge_memo.reused} inputs not merged again"
+            )
@@ -0,0 +1,97 @@
+"""Parsed source cache for pydantic-config-builder."""
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .memory import estimate_size
+
+# (st_mtime_ns, st_size, st_ino) of a file when it was parsed
+FileSignature = Tuple[int, int, int]
+
+
+def file_signature(path: Path) -> FileSignature:
+    """Get the signature used to detect changes to a file."""
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class SourceCache:
+    """Cache of parsed source files.
+
+    Entries are keyed by resolved path and re-parsed whenever the file's
+    modification time, size or inode changes. Parsed configs are shared by
+    every build that reads the file and must be treated as read-only;
+    merge_dicts never mutates its arguments, so merging them is safe.
+
+    With max_bytes, the estimated size of all cached configs is kept within
+    that many bytes by evicting the least recently used files; a file larger
+    than the limit is returned without being cached.
+
+    The cache is thread-safe; concurrent loads of the same file parse it once.
+    """
+
+    def __init__(self, loader: Callable[[Path], Dict[str, Any]], max_bytes: Optional[int] = None):
+        """Initialize cache with the function used to parse files."""
+        self.loader = loader
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+        # Least recently used first: (signature, parsed config, estimated size)
+        self._entries: "OrderedDict[Path, Tuple[FileSignature, Dict[str, Any], int]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._path_locks: Dict[Path, threading.Lock] = {}
+
+    def __len__(self) -> int:
+        """Number of cached files."""
+        return len(self._entries)
+
+    def load(self, path: Path) -> Dict[str, Any]:
+        """Load a parsed file, parsing it only if it is not cached or has changed."""
+        key = path.resolve()
+        with self._lock:
+            path_lock = self._path_locks.setdefault(key, threading.Lock())
+
+        with path_lock:
+            signature = file_signature(key)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] == signature:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    return entry[1]
+
+            data = self.loader(key)
+            size = 0 if self.max_bytes is None else estimate_size(data)
+            with self._lock:
+                self.misses += 1
+                old = self._entries.pop(key, None)
+                if old is not None:
+                    self.nbytes -= old[2]
+                if self.max_bytes is None or size <= self.max_bytes:
+                    self._entries[key] = (signature, data, size)
+                    self.nbytes += size
+                    self._evict()
+            return data
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        while self.max_bytes is not None and self.nbytes > self.max_bytes:
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self.nbytes -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all cached files and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._path_locks.clear()
+            self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
@@ -1,19 +1,155 @@
-"""Command line interface for pydantic-config-builder."""
+"""Command line interface for pydantic-config-builder.
+
+Modules other than click are imported where they are needed, so that
+--help and --connect do not pay for importing pydantic and yaml.
+"""
+from contextlib import nullcontext
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, ContextManager, Dict, List, Optional, Tuple
 
 import click
-import yaml
 
-from .builder import ConfigBuilder
-from .config import ConfigModel
+from .graph import GRAPH_FORMATS
+
+if TYPE_CHECKING:
+    from .config import ConfigModel
+    from .profiling import Profiler
+
+
+def load_config(
+    config: Path,
+    group: Tuple[str, ...] = (),
+    verbose: bool = False,
+    profiler: Optional["Profiler"] = None,
+    snapshot: Optional[Path] = None,
+    refresh_snapshot: bool = False,
+    save_snapshot: bool = True,
+) -> "ConfigModel":
+    """Load configuration file, checking that some of the given groups exist.
+
+    With a snapshot path, the validated build groups are saved there and
+    loaded instead of parsing and validating the file again while its
+    content is unchanged; refresh_snapshot ignores a saved snapshot and
+    save_snapshot=False only reads it.
+    """
+    from .config import BuildConfig, ConfigModel
+    from .profiling import Span
+
+    def phase(name: str) -> ContextManager[Span]:
+        return nullcontext(Span()) if profiler is None else profiler.phase(name, str(config))
+
+    config_model: Optional[ConfigModel] = None
+    config_hash = ""
+    if snapshot is not None:
+        from .incremental import hash_file, load_config_snapshot
+
+        try:
+            with phase("config_load"):
+                config_hash = hash_file(config)
+                builds = None if refresh_snapshot else load_config_snapshot(snapshot, config_hash)
+        except OSError as err:
+            raise click.ClickException(f"Failed to load configuration file: {err}") from err
+        if builds is not None:
+            if verbose:
+                click.echo(f"Using configuration snapshot: {snapshot}")
+            # The snapshot holds validated data, so validation is skipped
+            config_model = ConfigModel.model_construct(
+                builds={
+                    name: BuildConfig.model_construct(input=b["input"], output=b["output"])
+                    for name, b in builds.items()
+                }
+            )
+
+    if config_model is None:
+        config_model = _parse_config(config, phase)
+        if snapshot is not None and save_snapshot:
+            from .incremental import save_config_snapshot
+
+            try:
+                save_config_snapshot(snapshot, config_hash, config_model.model_dump()["builds"])
+            except OSError as err:
+                if verbose:
+                    click.echo(f"Failed to save configuration snapshot: {err}")
+
+    # Check groups if specified; the builder selects them and their dependencies
+    if group:
+        if verbose:
+            click.echo(f"Filtering groups: {', '.join(group)}")
+        if not any(name in config_model.builds for name in group):
+            raise click.ClickException(
+                f"None of the specified groups {group} exist in configuration"
+            )
+
+    return config_model
+
+
+def _parse_size(value: str) -> int:
+    """Parse a --memory-budget value."""
+    from .memory import parse_size
+
+    try:
+        return parse_size(value)
+    except ValueError as err:
+        raise click.BadParameter(str(err)) from err
+
+
+def _parse_config(config: Path, phase: Callable[[str], ContextManager[Any]]) -> "ConfigModel":
+    """Parse and validate configuration file."""
+    import yaml
+
+    from .config import ConfigModel
+
+    # Load configuration
+    try:
+        with phase("config_load"), open(config, "r") as f:
+            config_data = yaml.safe_load(f)
+    except Exception as err:
+        raise click.ClickException(f"Failed to load configuration file: {err}") from err
+
+    # Parse configuration
+    try:
+        with phase("validate"):
+            # Convert old format to new format if necessary
+            if not any(
+                isinstance(v, dict) and "input" in v and "output" in v for v in config_data.values()
+            ):
+                # Old format: Convert to new format
+                builds = {}
+                for output_path, input_paths in config_data.items():
+                    group_name = str(
+                        Path(output_path).stem
+                    )  # Use filename without extension as group name
+                    builds[group_name] = {
+                        "input": input_paths,
+                        "output": [output_path],
+                    }
+                config_data = builds
+
+            return ConfigModel(builds=config_data)
+    except Exception as err:
+        raise click.ClickException(f"Invalid configuration format: {err}") from err
 
 
 @click.command(context_settings={"help_option_names": ["-h", "--help"]})
 @click.option(
     "-c",
     "--config",
+    multiple=True,
     type=click.Path(exists=True, dir_okay=False, path_type=Path),
-    help="Configuration file path",
+    help="Configuration file path. Can be used multiple times to build several in one process.",
+)
+@click.option(
+    "--discover",
+    multiple=True,
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    help="Also build every pydantic-config-builder.yaml/.yml found under this directory.",
+)
+@click.option(
+    "--config-jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of configuration files to build in parallel.",
 )
 @click.option(
     "-v",
@@ -25,16 +161,177 @@ from .config import ConfigModel
     "-g",
     "--group",
     multiple=True,
-    help="Only build specified groups. Can be used multiple times.",
+    help="Only build specified groups and the groups they depend on. Can be used multiple times.",
+)
+@click.option(
+    "--write-dependencies/--no-write-dependencies",
+    default=True,
+    show_default=True,
+    help="With -g, also write the outputs of groups the specified groups depend on.",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Skip outputs whose inputs have not changed since the last incremental build.",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Rebuild all outputs even if they are up to date (with --incremental).",
+)
+@click.option(
+    "--yaml-backend",
+    type=click.Choice(["auto", "c", "python"]),
+    default="auto",
+    show_default=True,
+    help="YAML implementation: libyaml (c), pure Python, or libyaml when available (auto).",
+)
+@click.option(
+    "--sort-keys",
+    type=click.Choice(["natural", "recursive", "none"]),
+    default="natural",
+    show_default=True,
+    help="Key order: natural top-level keys, natural keys at every level, or merged order.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of groups to build in parallel, parsing and dumping YAML in worker processes.",
+)
+@click.option(
+    "--io-concurrency",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of files to read or write at once, to hide file system latency.",
+)
+@click.option(
+    "--memory-budget",
+    metavar="SIZE",
+    callback=lambda ctx, param, value: None if value is None else _parse_size(value),
+    help="Evict parsed sources beyond SIZE (e.g. 256M) and release outputs no group reads.",
+)
+@click.option(
+    "--graph",
+    "graph_format",
+    type=click.Choice(GRAPH_FORMATS),
+    help="Print the group dependency graph in the given format instead of building.",
 )
-def main(config: Path | None, verbose: bool, group: tuple[str]) -> None:
+@click.option(
+    "--check",
+    is_flag=True,
+    help="Write nothing; list outputs that differ from what would be built and exit with 1.",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    help="Keep running and rebuild affected groups whenever their sources change.",
+)
+@click.option(
+    "--serve",
+    "serve_socket",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Keep caches warm and serve build requests on this Unix socket.",
+)
+@click.option(
+    "--connect",
+    "connect_socket",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Ask the server listening on this Unix socket to build instead of building here.",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Write outputs one top-level key at a time to reduce memory use for large outputs.",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Print time spent in each build phase and the slowest files and groups.",
+)
+@click.option(
+    "--profile-output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write a cProfile dump (.prof) or a JSON trace (any other suffix). Implies --profile.",
+)
+@click.option(
+    "--profile-top",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help="Number of slowest files and groups to print with --profile.",
+)
+def main(
+    config: Tuple[Path, ...],
+    discover: Tuple[Path, ...],
+    config_jobs: int,
+    verbose: bool,
+    group: tuple[str],
+    write_dependencies: bool,
+    incremental: bool,
+    force: bool,
+    yaml_backend: str,
+    sort_keys: str,
+    jobs: int,
+    io_concurrency: int,
+    memory_budget: Optional[int],
+    graph_format: str | None,
+    check: bool,
+    watch: bool,
+    serve_socket: Path | None,
+    connect_socket: Path | None,
+    stream: bool,
+    profile: bool,
+    profile_output: Path | None,
+    profile_top: int,
+) -> None:
     """Build YAML configurations by merging multiple files."""
+    if check and (
+        watch or serve_socket is not None or connect_socket is not None or graph_format is not None
+    ):
+        raise click.ClickException(
+            "--check cannot be used with --watch, --serve, --connect or --graph"
+        )
+    if connect_socket is not None:
+        from .client import BuildClient, ServerError
+
+        try:
+            result = BuildClient(connect_socket).build(group or None)
+        except (OSError, ServerError) as err:
+            raise click.ClickException(f"Failed to build configurations: {err}") from err
+        if verbose:
+            for path in result["written"]:
+                click.echo(f"Wrote {path}")
+            click.echo(
+                f"Wrote {len(result['written'])} outputs, {len(result['unchanged'])} unchanged"
+            )
+        return
+
+    configs: List[Path] = []
+    seen = set()
+    if discover:
+        from .batch import discover_configs
+
+        config = config + tuple(p for root in discover for p in discover_configs(root))
+        if not config:
+            raise click.ClickException(
+                f"No configuration files found in {', '.join(str(p) for p in discover)}"
+            )
+    for config_file in config:
+        if config_file.resolve() not in seen:
+            seen.add(config_file.resolve())
+            configs.append(config_file)
+
     # Use default config file if not specified
-    if config is None:
+    if not configs:
         # Try both .yaml and .yml extensions
         for ext in [".yaml", ".yml"]:
-            config = Path(f"pydantic-config-builder{ext}")
-            if config.exists():
+            default_config = Path(f"pydantic-config-builder{ext}")
+            if default_config.exists():
+                configs.append(default_config)
                 break
         else:
             raise click.ClickException(
@@ -43,60 +340,149 @@ def main(config: Path | None, verbose: bool, group: tuple[str]) -> None:
                 "found in current directory"
             )
 
-    if verbose:
-        click.echo(f"Using configuration file: {config}")
-
-    # Load configuration
-    try:
-        with open(config, "r") as f:
-            config_data = yaml.safe_load(f)
-    except Exception as err:
-        raise click.ClickException(f"Failed to load configuration file: {err}") from err
-
-    # Parse configuration
-    try:
-        # Convert old format to new format if necessary
-        if not any(
-            isinstance(v, dict) and "input" in v and "output" in v for v in config_data.values()
-        ):
-            # Old format: Convert to new format
-            builds = {}
-            for output_path, input_paths in config_data.items():
-                group_name = str(
-                    Path(output_path).stem
-                )  # Use filename without extension as group name
-                builds[group_name] = {
-                    "input": input_paths,
-                    "output": [output_path],
-                }
-            config_data = builds
+    if len(configs) > 1 and (graph_format is not None or watch or serve_socket is not None):
+        raise click.ClickException("--graph, --watch and --serve need a single configuration file")
 
-        config_model = ConfigModel(builds=config_data)
-    except Exception as err:
-        raise click.ClickException(f"Invalid configuration format: {err}") from err
+    from .batch import build_configs, check_configs
+    from .builder import ConfigBuilder
+    from .globindex import GlobIndex
+    from .incremental import config_snapshot_path
+    from .options import BuildOptions
+    from .profiling import Profiler
 
-    # Filter groups if specified
-    if group:
+    options = BuildOptions(
+        incremental=incremental,
+        force=force,
+        yaml_backend=yaml_backend,
+        sort_keys=sort_keys,
+        jobs=jobs,
+        io_concurrency=io_concurrency,
+        stream=stream,
+        memory_budget=memory_budget,
+    )
+    profiler = Profiler() if profile or profile_output is not None else None
+    # Configurations built together share parsed sources and directory listings
+    source_cache = None
+    glob_index = GlobIndex() if len(configs) > 1 else None
+    builders: Dict[Path, ConfigBuilder] = {}
+    for config_path in configs:
         if verbose:
-            click.echo(f"Filtering groups: {', '.join(group)}")
-        filtered_builds = {k: v for k, v in config_model.builds.items() if k in group}
-        if not filtered_builds:
-            raise click.ClickException(
-                f"None of the specified groups {group} exist in configuration"
+            click.echo(f"Using configuration file: {config_path}")
+
+        snapshot = None
+        if incremental:
+            snapshot = config_snapshot_path(config_path)
+        # Groups only have to exist in one of several configurations
+        config_model = load_config(
+            config_path,
+            group if len(configs) == 1 else (),
+            verbose,
+            profiler,
+            snapshot,
+            force,
+            save_snapshot=not check,
+        )
+        try:
+            builder = ConfigBuilder(
+                config=config_model,
+                base_dir=config_path.parent,
+                verbose=verbose,
+                options=options,
+                profiler=profiler,
+                groups=group or None,
+                source_cache=source_cache,
+                glob_index=glob_index,
             )
-        config_model = ConfigModel(builds=filtered_builds)
+        except Exception as err:
+            raise click.ClickException(f"Failed to build configurations: {err}") from err
+        source_cache = builder.source_cache
+        builders[config_path] = builder
+
+    if group and not any(name in b.config.builds for b in builders.values() for name in group):
+        raise click.ClickException(f"None of the specified groups {group} exist in configuration")
 
     # Build configurations
     try:
-        builder = ConfigBuilder(
-            config=config_model,
-            base_dir=config.parent,
-            verbose=verbose,
-        )
-        builder.build_all()
+        if graph_format is not None:
+            from .graph import to_dot, to_json
+
+            click.echo(
+                to_dot(builder.plan) if graph_format == "dot" else to_json(builder.plan), nl=False
+            )
+            return
+        if serve_socket is not None:
+            from .server import BuildServer
+
+            click.echo(f"Serving builds on {serve_socket}, press Ctrl+C to stop")
+            try:
+                BuildServer(
+                    builder,
+                    serve_socket,
+                    config_path=config_path,
+                    reload_config=lambda: load_config(config_path, group, snapshot=snapshot),
+                ).serve_forever()
+            except KeyboardInterrupt:
+                pass
+            return
+        if watch:
+            from .watch import watch as watch_builds
+
+            click.echo("Watching for changes, press Ctrl+C to stop")
+            try:
+                watch_builds(
+                    builder,
+                    config_path=config_path,
+                    reload_config=lambda: load_config(config_path, group, snapshot=snapshot),
+                )
+            except KeyboardInterrupt:
+                pass
+            return
+        # Dependencies of the specified groups are built in memory either way
+        build_groups = group if group and not write_dependencies else None
+        stale: List[Path] = []
+
+        def run() -> None:
+            if check:
+                stale.extend(check_configs(builders, config_jobs, build_groups))
+            else:
+                build_configs(builders, config_jobs, build_groups)
+
+        # cProfile only sees the calling thread, so use -j 1 for complete dumps
+        if profile_output is not None and profile_output.suffix == ".prof":
+            import cProfile
+
+            with cProfile.Profile() as prof:
+                run()
+            prof.dump_stats(profile_output)
+        else:
+            run()
     except Exception as err:
         raise click.ClickException(f"Failed to build configurations: {err}") from err
 
+    if profiler is not None:
+        click.echo(profiler.summary(profile_top))
+        if profile_output is not None and profile_output.suffix != ".prof":
+            profiler.write_trace(profile_output, profile_top)
+
+    if check:
+        if stale:
+            raise click.ClickException(
+                f"{len(stale)} outputs are not up to date:\n"
+                + "\n".join(f"  {path}" for path in stale)
+            )
+        click.echo("All outputs are up to date")
+    elif incremental:
+        rebuilt = sum(len(b.rebuilt_outputs) for b in builders.values())
+        skipped = sum(len(b.skipped_outputs) for b in builders.values())
+        click.echo(f"Rebuilt {rebuilt} outputs, skipped {skipped} up-to-date outputs")
+
+    if memory_budget is not None or verbose:
+        from .memory import format_size, peak_rss
+
+        rss = peak_rss()
+        if rss is not None:
+            click.echo(f"Peak memory: {format_size(rss)}")
+
     if verbose:
         click.echo("Configuration build completed successfully")
 
@@ -0,0 +1,58 @@
+"""Client for a running pydantic-config-builder server."""
+import json
+import socket
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+
+class ServerError(Exception):
+    """Raised when the server reports that a request failed."""
+
+
+class BuildClient:
+    """Send requests to a build server over its Unix socket.
+
+    Only the standard library is imported, so clients start quickly.
+    """
+
+    def __init__(self, socket_path: Union[str, Path], timeout: Optional[float] = None):
+        """Initialize client for the server listening at socket_path."""
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def request(self, command: str, **params: Any) -> Dict[str, Any]:
+        """Send one request and return the response; raises ServerError on failure."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(str(self.socket_path))
+            sock.sendall(json.dumps({"command": command, **params}).encode() + b"\n")
+            with sock.makefile("rb") as f:
+                line = f.readline()
+        if not line:
+            raise ServerError("Server closed the connection without responding")
+        response: Dict[str, Any] = json.loads(line)
+        if not response.get("ok"):
+            raise ServerError(response.get("error", "Unknown error"))
+        return response
+
+    def build(self, groups: Optional[Sequence[str]] = None) -> Dict[str, List[str]]:
+        """Build all or the given groups; returns written, unchanged and skipped outputs."""
+        response = self.request("build", groups=None if groups is None else list(groups))
+        return {key: response[key] for key in ("written", "unchanged", "skipped")}
+
+    def get(self, output: str) -> Dict[str, Any]:
+        """Get the merged configuration of an output."""
+        config: Dict[str, Any] = self.request("get", output=output)["config"]
+        return config
+
+    def get_yaml(self, output: str) -> str:
+        """Get the merged configuration of an output as the YAML written to it."""
+        return str(self.request("get", output=output, format="yaml")["config"])
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics of the server."""
+        return self.request("stats")
+
+    def shutdown(self) -> None:
+        """Stop the server."""
+        self.request("shutdown")
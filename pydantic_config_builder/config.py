@@ -1,10 +1,12 @@
 """Configuration model for pydantic-config-builder."""
 import glob
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
+from .globindex import GlobIndex, has_magic
+
 
 class BuildConfig(BaseModel):
     """Configuration for a single build group."""
@@ -32,37 +34,51 @@ class ConfigModel(BaseModel):
             return Path(path)
         return base_dir / path
 
-    def _expand_glob(self, pattern: str, base_dir: Path) -> List[Path]:
-        """Expand glob pattern to list of paths."""
+    def _expand_glob(
+        self, pattern: str, base_dir: Path, index: Optional[GlobIndex] = None
+    ) -> List[Path]:
+        """Expand glob pattern to list of paths, using the directory index if given."""
         # パターンを絶対パスに解決
         abs_pattern = str(self.resolve_path(pattern, base_dir))
         # globで検索
-        matches = glob.glob(abs_pattern, recursive=True)
+        if index is not None:
+            matches = index.glob(abs_pattern)
+        else:
+            matches = glob.glob(abs_pattern, recursive=True)
         if not matches:
             return []
         # 重複を排除して返す
         return sorted(set(Path(p) for p in matches))
 
+    def resolve_sources(
+        self, build_config: BuildConfig, base_dir: Path, index: Optional[GlobIndex] = None
+    ) -> List[Path]:
+        """Resolve input paths of a build group, expanding glob patterns."""
+        resolved_sources: List[Path] = []
+        seen_paths = set()
+        for src_path in build_config.input:
+            # ワイルドカードを含むパターンの場合は展開
+            if has_magic(src_path):
+                paths = self._expand_glob(src_path, base_dir, index)
+                for path in paths:
+                    if path not in seen_paths:
+                        seen_paths.add(path)
+                        resolved_sources.append(path)
+            else:
+                path = self.resolve_path(src_path, base_dir)
+                if path not in seen_paths:
+                    seen_paths.add(path)
+                    resolved_sources.append(path)
+        return resolved_sources
+
     def get_resolved_config(self, base_dir: Path) -> Dict[Path, List[Path]]:
         """Get resolved configuration with absolute paths."""
         result = {}
+        # All groups share one index so each directory is listed once
+        index = GlobIndex()
         for _, build_config in self.builds.items():
             # 入力ファイルを解決
-            resolved_sources: List[Path] = []
-            seen_paths = set()
-            for src_path in build_config.input:
-                # ワイルドカードを含むパターンの場合は展開
-                if any(c in src_path for c in "*?["):
-                    paths = self._expand_glob(src_path, base_dir)
-                    for path in paths:
-                        if path not in seen_paths:
-                            seen_paths.add(path)
-                            resolved_sources.append(path)
-                else:
-                    path = self.resolve_path(src_path, base_dir)
-                    if path not in seen_paths:
-                        seen_paths.add(path)
-                        resolved_sources.append(path)
+            resolved_sources = self.resolve_sources(build_config, base_dir, index)
 
             # 各出力パスに対して同じ入力ファイルを設定
             for out_path in build_config.output:
@@ -0,0 +1,143 @@
+"""Shared directory index for expanding glob patterns."""
+import fnmatch
+import os
+import threading
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# (name, is_dir) of every entry of a directory
+Listing = List[Tuple[str, bool]]
+
+
+def has_magic(pattern: str) -> bool:
+    """Check whether a path contains glob wildcards."""
+    return any(c in pattern for c in "*?[")
+
+
+def _is_hidden(name: str) -> bool:
+    return name.startswith(".")
+
+
+def _is_recursive(pattern: str) -> bool:
+    return pattern == "**"
+
+
+class GlobIndex:
+    """Directory listings shared by every glob pattern expanded through it.
+
+    Each directory is scanned with os.scandir at most once, however many
+    patterns walk through it; patterns are then matched against the cached
+    listings in memory. Matching follows glob.glob(recursive=True) exactly:
+    hidden entries only match patterns starting with a dot, and ``**`` matches
+    zero or more directories.
+
+    Listings are not refreshed, so use a new index or invalidate the
+    directories of files that may have been added or removed.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self.scans = 0
+        self._listings: Dict[str, Listing] = {}
+        self._lock = threading.Lock()
+
+    def glob(self, pattern: str) -> List[str]:
+        """Return paths matching a pattern, like glob.glob(pattern, recursive=True)."""
+        return [path for path in self._iglob(pattern, False) if path]
+
+    def invalidate(self, paths: Iterable[str]) -> None:
+        """Forget the listings of the directories containing paths and their ancestors."""
+        stale = set()
+        for path in paths:
+            parent = os.path.dirname(os.path.abspath(path))
+            while parent not in stale:
+                stale.add(parent)
+                parent, child = os.path.dirname(parent), parent
+                if parent == child:
+                    break
+        with self._lock:
+            for dirname in [d for d in self._listings if os.path.abspath(d or os.curdir) in stale]:
+                del self._listings[dirname]
+
+    def _listdir(self, dirname: str) -> Listing:
+        """List a directory, scanning it only the first time."""
+        # "a/" and "a" are the same directory; the root keeps its separator
+        dirname = dirname.rstrip(os.sep) or dirname
+        with self._lock:
+            listing = self._listings.get(dirname)
+        if listing is not None:
+            return listing
+
+        listing = []
+        try:
+            with os.scandir(dirname or os.curdir) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    listing.append((entry.name, is_dir))
+        except OSError:
+            pass
+        with self._lock:
+            self.scans += 1
+            return self._listings.setdefault(dirname, listing)
+
+    def _names(self, dirname: str, dironly: bool) -> List[str]:
+        return [name for name, is_dir in self._listdir(dirname) if is_dir or not dironly]
+
+    def _iglob(self, pathname: str, dironly: bool) -> Iterator[str]:
+        dirname, basename = os.path.split(pathname)
+        if not has_magic(pathname):
+            if basename:
+                if os.path.lexists(pathname):
+                    yield pathname
+            elif os.path.isdir(dirname):
+                yield pathname
+            return
+        if not dirname:
+            if _is_recursive(basename):
+                yield from self._glob2(dirname, dironly)
+            else:
+                yield from self._glob1(dirname, basename, dironly)
+            return
+        if dirname != pathname and has_magic(dirname):
+            dirs: Iterator[str] = self._iglob(dirname, True)
+        else:
+            dirs = iter([dirname])
+        for parent in dirs:
+            if not has_magic(basename):
+                names = self._glob0(parent, basename)
+            elif _is_recursive(basename):
+                names = list(self._glob2(parent, dironly))
+            else:
+                names = self._glob1(parent, basename, dironly)
+            for name in names:
+                yield os.path.join(parent, name)
+
+    def _glob0(self, dirname: str, basename: str) -> List[str]:
+        if basename:
+            if os.path.lexists(os.path.join(dirname, basename)):
+                return [basename]
+        elif os.path.isdir(dirname):
+            return [basename]
+        return []
+
+    def _glob1(self, dirname: str, pattern: str, dironly: bool) -> List[str]:
+        names = self._names(dirname, dironly)
+        if not _is_hidden(pattern):
+            names = [name for name in names if not _is_hidden(name)]
+        return fnmatch.filter(names, pattern)
+
+    def _glob2(self, dirname: str, dironly: bool) -> Iterator[str]:
+        yield ""
+        yield from self._rlistdir(dirname, dironly)
+
+    def _rlistdir(self, dirname: str, dironly: bool) -> Iterator[str]:
+        for name, is_dir in self._listdir(dirname):
+            if _is_hidden(name) or (dironly and not is_dir):
+                continue
+            yield name
+            if is_dir:
+                path = os.path.join(dirname, name) if dirname else name
+                for sub in self._rlistdir(path, dironly):
+                    yield os.path.join(name, sub)
@@ -0,0 +1,77 @@
+"""Dependency graph export for pydantic-config-builder."""
+import json
+from typing import TYPE_CHECKING, Any, Dict, List
+
+# Only needed for annotations; importing the plan pulls in pydantic
+if TYPE_CHECKING:
+    from .plan import BuildPlan
+
+GRAPH_FORMATS = ("dot", "json")
+
+
+def graph_data(plan: "BuildPlan") -> Dict[str, Any]:
+    """Describe groups, their outputs and dependencies with depth and fan-in/out.
+
+    Depth is the length of the longest chain of groups leading to a group,
+    fan-in the number of groups it reads from and fan-out the number of
+    groups reading its outputs.
+    """
+    depths = plan.depths()
+    groups: List[Dict[str, Any]] = []
+    for name in plan.order:
+        group = plan.groups[name]
+        groups.append(
+            {
+                "name": name,
+                "depth": depths[name],
+                "fan_in": len(plan.dependencies[name]),
+                "fan_out": len(plan.dependents[name]),
+                "dependencies": plan.dependencies[name],
+                "dependents": plan.dependents[name],
+                "sources": [str(p) for p in group.sources],
+                "outputs": [str(p) for p in group.outputs],
+            }
+        )
+    return {
+        "groups": groups,
+        "max_depth": max(depths.values(), default=0),
+        "longest_chain": plan.longest_chain(),
+    }
+
+
+def to_json(plan: "BuildPlan") -> str:
+    """Export the dependency graph as JSON."""
+    return json.dumps(graph_data(plan), indent=2)
+
+
+def _escape(value: str) -> str:
+    """Escape a string for use inside a quoted DOT identifier."""
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _quote(value: str) -> str:
+    """Quote a string as a DOT identifier."""
+    return f'"{_escape(value)}"'
+
+
+def to_dot(plan: "BuildPlan") -> str:
+    """Export the dependency graph in Graphviz DOT format.
+
+    Groups are boxes labelled with depth and fan-in, outputs are ellipses.
+    Edges run from a group to its outputs and from an output to every group
+    that reads it.
+    """
+    depths = plan.depths()
+    lines = ["digraph builds {", "  rankdir=LR;"]
+    for name in plan.order:
+        label = f"{_escape(name)}\\ndepth={depths[name]} fan_in={len(plan.dependencies[name])}"
+        lines.append(f"  {_quote('group:' + name)} [shape=box, label=\"{label}\"];")
+        for out_path in plan.groups[name].outputs:
+            lines.append(f"  {_quote(str(out_path))} [shape=ellipse];")
+            lines.append(f"  {_quote('group:' + name)} -> {_quote(str(out_path))};")
+    for name in plan.order:
+        for src_path in plan.groups[name].sources:
+            if src_path in plan.output_groups:
+                lines.append(f"  {_quote(str(src_path))} -> {_quote('group:' + name)};")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,190 @@
+"""Incremental build support for pydantic-config-builder."""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from . import __version__
+from .cache import file_signature
+
+CACHE_DIR_NAME = ".pydantic-config-builder-cache"
+MANIFEST_FILE_NAME = "manifest.json"
+
+# Validated build groups: name -> {"input": [...], "output": [...]}
+Builds = Dict[str, Dict[str, List[str]]]
+
+# Serializes saves of manifests shared by builders of several configurations
+_save_lock = threading.Lock()
+
+
+def hash_bytes(data: bytes) -> str:
+    """Get the content hash of serialized data."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_json(path: Path, data: Any, **options: Any) -> None:
+    """Write JSON to a file atomically, creating its directory."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A unique temporary file, so concurrent writers never replace each other's
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with open(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, **options)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def hash_file(path: Path) -> str:
+    """Get the content hash of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """Record of the inputs every output was last built from.
+
+    The manifest stores, per output, a digest of everything the output
+    depends on together with the hash of the written file. Content hashes of
+    source files are remembered with their file signature so unchanged files
+    are not read again on the next run.
+
+    Several configurations in one directory share a manifest, so saving
+    merges the entries changed since loading into the manifest on disk.
+    """
+
+    def __init__(self, path: Path):
+        """Initialize an empty manifest stored at path."""
+        self.path = path
+        self.outputs: Dict[str, Dict[str, Any]] = {}
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self._changed_outputs: Set[str] = set()
+        self._changed_files: Set[str] = set()
+
+    @classmethod
+    def load(cls, path: Path) -> "BuildManifest":
+        """Load manifest, starting empty if it is missing, invalid or outdated."""
+        manifest = cls(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return manifest
+        if not isinstance(data, dict) or data.get("version") != __version__:
+            return manifest
+        manifest.outputs = data.get("outputs", {})
+        manifest.files = data.get("files", {})
+        return manifest
+
+    def save(self) -> None:
+        """Merge changed entries into the manifest on disk, dropping files that no longer exist."""
+        with _save_lock:
+            saved = BuildManifest.load(self.path)
+            self.outputs = {
+                **saved.outputs,
+                **{k: self.outputs[k] for k in self._changed_outputs},
+            }
+            files = {**saved.files, **{k: self.files[k] for k in self._changed_files}}
+            self.files = {k: v for k, v in files.items() if os.path.exists(k)}
+            self._changed_outputs.clear()
+            self._changed_files.clear()
+            _write_json(
+                self.path,
+                {"version": __version__, "outputs": self.outputs, "files": self.files},
+                indent=1,
+                sort_keys=True,
+            )
+
+    def file_hash(self, path: Path) -> str:
+        """Get the content hash of a file, reusing the recorded hash if unchanged."""
+        key = str(path)
+        signature = list(file_signature(path))
+        entry = self.files.get(key)
+        if entry is not None and entry["signature"] == signature:
+            return str(entry["hash"])
+        content_hash = hash_file(path)
+        self.files[key] = {"signature": signature, "hash": content_hash}
+        self._changed_files.add(key)
+        return content_hash
+
+    def is_up_to_date(self, output_path: Path, digest: str) -> bool:
+        """Check whether an output was built from inputs with the given digest."""
+        entry = self.outputs.get(str(output_path))
+        if entry is None or entry["digest"] != digest:
+            return False
+        try:
+            signature = list(file_signature(output_path))
+        except FileNotFoundError:
+            return False
+        if entry["signature"] == signature:
+            return True
+        # Output was touched or replaced: compare its content instead
+        if hash_file(output_path) != entry["hash"]:
+            return False
+        entry["signature"] = signature
+        self._changed_outputs.add(str(output_path))
+        return True
+
+    def record(self, output_path: Path, digest: str, content_hash: str) -> None:
+        """Record that an output has been written from inputs with the given digest."""
+        self.outputs[str(output_path)] = {
+            "digest": digest,
+            "hash": content_hash,
+            "signature": list(file_signature(output_path)),
+        }
+        self._changed_outputs.add(str(output_path))
+
+
+def _is_builds(data: Any) -> bool:
+    """Check whether data has the shape of validated build groups."""
+    return isinstance(data, dict) and all(
+        isinstance(group, dict)
+        and all(
+            isinstance(group.get(field), list) and all(isinstance(p, str) for p in group[field])
+            for field in ("input", "output")
+        )
+        for group in data.values()
+    )
+
+
+def config_snapshot_path(config_path: Path) -> Path:
+    """Get where the snapshot of a configuration file is saved, one per file in its directory."""
+    return config_path.parent / CACHE_DIR_NAME / f"config-{config_path.name}.json"
+
+
+def load_config_snapshot(path: Path, config_hash: str) -> Optional[Builds]:
+    """Load the build groups saved for a configuration file with the given content hash.
+
+    Returns None if the snapshot is missing, invalid, or was saved for other
+    content or by another version.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != __version__
+        or data.get("config_hash") != config_hash
+        or not _is_builds(data.get("builds"))
+    ):
+        return None
+    builds: Builds = data["builds"]
+    return builds
+
+
+def save_config_snapshot(path: Path, config_hash: str, builds: Builds) -> None:
+    """Save the validated build groups of a configuration file with the given content hash."""
+    _write_json(
+        path,
+        {"version": __version__, "config_hash": config_hash, "builds": builds},
+        separators=(",", ":"),
+    )
@@ -0,0 +1,164 @@
+"""Single-pass merging of many configurations."""
+import threading
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+
+def _merge_into(target: Dict[Any, Any], overlay: Dict[Any, Any], owned: Dict[int, Any]) -> None:
+    """Merge overlay into target, copying shared mappings before changing them."""
+    for key, value in overlay.items():
+        if key in target:
+            current = target[key]
+            if isinstance(current, dict) and isinstance(value, dict):
+                if id(current) not in owned:
+                    current = current.copy()
+                    owned[id(current)] = current
+                    target[key] = current
+                _merge_into(current, value, owned)
+                continue
+        target[key] = value
+
+
+def merge_all(
+    configs: Iterable[Dict[str, Any]], base: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Merge configurations left to right in a single pass.
+
+    The result is equal to folding merge_dicts over base and configs, but a
+    mapping is only copied when a later configuration changes it, and then
+    only once; all later changes go to that copy. Mappings that are never
+    overridden are shared with the inputs, which are not modified.
+    """
+    result: Dict[str, Any] = {} if base is None else base.copy()
+    # Mappings created by this merge, keyed by id; holding them keeps ids unique
+    owned: Dict[int, Any] = {id(result): result}
+    for config in configs:
+        _merge_into(result, config, owned)
+    return result
+
+
+def branch_points(sequences: Sequence[Sequence[Hashable]]) -> List[List[int]]:
+    """Get, for each sequence, the prefix lengths worth memoizing when merging them all.
+
+    These are the lengths at which a prefix shared with another sequence
+    branches or ends: the deepest points from which more than one merge can
+    continue.
+    """
+    # Prefix trie: node 0 is the root, edges map (node, item) to a child node
+    edges: Dict[Tuple[int, Hashable], int] = {}
+    counts = [0]
+    paths = []
+    for sequence in sequences:
+        node = 0
+        path = []
+        for item in sequence:
+            child = edges.get((node, item))
+            if child is None:
+                child = edges[(node, item)] = len(counts)
+                counts.append(0)
+            counts[child] += 1
+            node = child
+            path.append(child)
+        paths.append(path)
+    return [
+        [
+            depth + 1
+            for depth, node in enumerate(path)
+            if counts[node] > 1
+            and (depth + 1 == len(path) or counts[path[depth + 1]] < counts[node])
+        ]
+        for path in paths
+    ]
+
+
+class _MemoNode:
+    """Node of a merge memo: one input after the inputs of its ancestors."""
+
+    __slots__ = ("config", "result", "children")
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config
+        self.result: Optional[Dict[str, Any]] = None
+        self.children: Dict[int, "_MemoNode"] = {}
+
+
+class MergeMemo:
+    """Merge results of input prefixes, reused by later merges starting with the same inputs.
+
+    Inputs are identified by object: the source cache returns the same
+    object for a file until it changes, so a changed file never matches a
+    memoized prefix. Nodes keep their inputs alive, so an id identifies one
+    input for as long as it is memoized. Thread-safe.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty memo."""
+        self.hits = 0
+        self.reused = 0
+        self._root = _MemoNode()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of memoized merge results."""
+        with self._lock:
+            count = 0
+            stack = [self._root]
+            while stack:
+                node = stack.pop()
+                count += node.result is not None
+                stack.extend(node.children.values())
+            return count
+
+    def merge(
+        self, configs: Sequence[Dict[str, Any]], checkpoints: Iterable[int] = ()
+    ) -> Tuple[Dict[str, Any], int]:
+        """Merge configurations like merge_all, reusing the longest memoized prefix.
+
+        The results after the prefixes of the given lengths are memoized.
+        Returns the result and the number of inputs taken from the memo.
+        """
+        marks = set(checkpoints)
+        base: Optional[Dict[str, Any]] = None
+        reused = 0
+        with self._lock:
+            node = self._root
+            for depth, config in enumerate(configs, 1):
+                child = node.children.get(id(config))
+                if child is None:
+                    break
+                node = child
+                if node.result is not None:
+                    base, reused = node.result, depth
+            if reused:
+                self.hits += 1
+                self.reused += reused
+        if base is not None and reused == len(configs):
+            return base, reused
+
+        result = base
+        start = reused
+        for end in sorted(c for c in marks if reused < c < len(configs)):
+            result = merge_all(configs[start:end], result)
+            self._store(configs[:end], result)
+            start = end
+        result = merge_all(configs[start:], result)
+        if len(configs) in marks:
+            self._store(configs, result)
+        return result, reused
+
+    def _store(self, configs: Sequence[Dict[str, Any]], result: Dict[str, Any]) -> None:
+        """Memoize the result of merging configs."""
+        with self._lock:
+            node = self._root
+            for config in configs:
+                child = node.children.get(id(config))
+                if child is None:
+                    child = node.children[id(config)] = _MemoNode(config)
+                node = child
+            node.result = result
+
+    def clear(self) -> None:
+        """Forget all memoized results and reset counters."""
+        with self._lock:
+            self._root = _MemoNode()
+        self.hits = 0
+        self.reused = 0
@@ -0,0 +1,25 @@
+"""Build options for pydantic-config-builder."""
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class BuildOptions:
+    """Options of a ConfigBuilder; none of them changes the content of outputs.
+
+    See ConfigBuilder.build_all for how they affect a build.
+    """
+
+    # Skip outputs whose inputs are unchanged since the last build, unless forced
+    incremental: bool = False
+    force: bool = False
+    # YAML implementation (auto, c or python) and key order (natural, recursive or none)
+    yaml_backend: str = "auto"
+    sort_keys: str = "natural"
+    # Groups built at once, and files read or written at once
+    jobs: int = 1
+    io_concurrency: int = 1
+    # Serialize and write outputs one top-level key at a time
+    stream: bool = False
+    # Estimated bytes of parsed sources and built configurations to keep in memory
+    memory_budget: Optional[int] = None
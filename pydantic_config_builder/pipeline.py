@@ -0,0 +1,76 @@
+"""Concurrent file I/O for pydantic-config-builder."""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Callable, Iterable, List, Optional, Type
+
+
+class IOPipeline:
+    """Thread pool reading sources ahead of the build and writing outputs behind it.
+
+    Prefetching calls a loader for many files at once, so their latency
+    overlaps instead of adding up; errors are ignored there, as the build
+    loads the files again and reports them in context. Writes run in the
+    background while later groups are built, and wait() re-raises the first
+    error of a write.
+    """
+
+    def __init__(self, concurrency: int):
+        """Initialize pipeline running at most concurrency operations at once."""
+        self.concurrency = concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="pydantic-config-builder-io"
+        )
+        self._prefetches: List["Future[Any]"] = []
+        self._writes: List["Future[None]"] = []
+        self._lock = threading.Lock()
+
+    def prefetch(self, paths: Iterable[Path], load: Callable[[Path], Any]) -> None:
+        """Start loading files in the background."""
+        futures = [self._executor.submit(load, path) for path in paths]
+        with self._lock:
+            self._prefetches.extend(futures)
+
+    def wait_prefetched(self) -> None:
+        """Wait until all started loads have finished."""
+        with self._lock:
+            futures, self._prefetches = self._prefetches, []
+        wait(futures)
+
+    def submit_write(self, write: Callable[[], None]) -> None:
+        """Run a write in the background."""
+        future = self._executor.submit(write)
+        with self._lock:
+            self._writes.append(future)
+
+    def wait(self) -> None:
+        """Wait until all writes have finished, re-raising the first error."""
+        with self._lock:
+            futures, self._writes = self._writes, []
+        wait(futures)
+        for future in futures:
+            error = future.exception()
+            if error is not None:
+                raise error
+
+    def close(self) -> None:
+        """Cancel loads that have not started and wait for running operations."""
+        with self._lock:
+            for future in self._prefetches:
+                future.cancel()
+            self._prefetches = []
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "IOPipeline":
+        """Use the pipeline as a context manager that closes it on exit."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Close the pipeline."""
+        self.close()
@@ -0,0 +1,197 @@
+"""Resolved build plan for pydantic-config-builder."""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from .config import ConfigModel
+from .globindex import GlobIndex
+
+
+class CircularDependencyError(ValueError):
+    """Raised when groups depend on each other's outputs in a cycle."""
+
+    def __init__(self, cycle: List[str]):
+        """Initialize error with the groups of the cycle, first group repeated last."""
+        self.cycle = cycle
+        super().__init__(f"Circular dependency between groups: {' -> '.join(cycle)}")
+
+
+@dataclass(frozen=True)
+class ResolvedGroup:
+    """Build group with resolved source and output paths."""
+
+    name: str
+    sources: List[Path]
+    outputs: List[Path]
+
+
+class BuildPlan:
+    """Build plan with all paths and group dependencies resolved up front."""
+
+    def __init__(self, groups: Dict[str, ResolvedGroup]):
+        """Initialize plan from resolved groups."""
+        self.groups = groups
+
+        # Output paths map to the group that writes them. As with
+        # ConfigModel.get_resolved_config, a later group wins on conflicts.
+        self.output_groups: Dict[Path, str] = {}
+        for group in groups.values():
+            for out_path in group.outputs:
+                self.output_groups[out_path] = group.name
+        self.output_sources: Dict[Path, List[Path]] = {
+            out_path: groups[name].sources for out_path, name in self.output_groups.items()
+        }
+        self.output_paths: FrozenSet[Path] = frozenset(self.output_sources)
+
+        # Group dependencies: a group depends on every group whose output it reads
+        self.dependencies: Dict[str, List[str]] = {}
+        self.dependents: Dict[str, List[str]] = {name: [] for name in groups}
+        for group in groups.values():
+            deps: List[str] = []
+            for src_path in group.sources:
+                dep = self.output_groups.get(src_path)
+                if dep is not None and dep not in deps:
+                    deps.append(dep)
+                    self.dependents[dep].append(group.name)
+            self.dependencies[group.name] = deps
+
+        self._order: Optional[List[str]] = None
+
+    @classmethod
+    def from_config(
+        cls,
+        config: ConfigModel,
+        base_dir: Path,
+        index: Optional[GlobIndex] = None,
+        groups: Optional[Iterable[str]] = None,
+    ) -> "BuildPlan":
+        """Resolve the build groups of a configuration.
+
+        With groups given, the plan only has those groups and, transitively,
+        the groups whose outputs they read; glob patterns of other groups are
+        not expanded. Unknown names are ignored.
+
+        Glob patterns of all groups are matched against one shared directory
+        index, so each directory is listed at most once; pass an index to
+        share it further.
+        """
+        if index is None:
+            index = GlobIndex()
+
+        # Output paths are known without touching the file system. A path
+        # claimed again by a later group is dropped from the earlier one so
+        # each path is written once.
+        outputs = {
+            name: [config.resolve_path(p, base_dir) for p in build_config.output]
+            for name, build_config in config.builds.items()
+        }
+        owners: Dict[Path, str] = {}
+        for name, out_paths in outputs.items():
+            for out_path in out_paths:
+                owners[out_path] = name
+
+        sources: Dict[str, List[Path]] = {}
+        pending = list(config.builds if groups is None else groups)
+        while pending:
+            name = pending.pop()
+            if name in sources or name not in config.builds:
+                continue
+            sources[name] = config.resolve_sources(config.builds[name], base_dir, index)
+            pending.extend(owners[p] for p in sources[name] if p in owners)
+
+        resolved = {
+            name: ResolvedGroup(
+                name=name,
+                sources=sources[name],
+                outputs=[p for p in outputs[name] if owners[p] == name],
+            )
+            for name in config.builds
+            if name in sources
+        }
+        return cls(resolved)
+
+    def group_for_output(self, output_path: Path) -> ResolvedGroup:
+        """Get the group that writes an output path."""
+        return self.groups[self.output_groups[output_path]]
+
+    @property
+    def order(self) -> List[str]:
+        """Groups ordered so every group comes after the groups it depends on.
+
+        Groups are visited in configuration order, each preceded by its not yet
+        ordered dependencies. Raises CircularDependencyError if the dependency
+        graph has a cycle.
+        """
+        return self._sort()
+
+    def _sort(self) -> List[str]:
+        """Compute and remember the dependency order of groups."""
+        if self._order is None:
+            order: List[str] = []
+            done = set()
+            for root in self.groups:
+                if root in done:
+                    continue
+                # Depth-first search without recursion; stack holds (group, next dependency index)
+                path: List[str] = []
+                on_path = set()
+                stack = [(root, 0)]
+                while stack:
+                    name, index = stack.pop()
+                    if index == 0:
+                        path.append(name)
+                        on_path.add(name)
+                    deps = self.dependencies[name]
+                    if index < len(deps):
+                        stack.append((name, index + 1))
+                        dep = deps[index]
+                        if dep in on_path:
+                            raise CircularDependencyError(path[path.index(dep) :] + [dep])
+                        if dep not in done:
+                            stack.append((dep, 0))
+                    else:
+                        path.pop()
+                        on_path.discard(name)
+                        done.add(name)
+                        order.append(name)
+            self._order = order
+        return self._order
+
+    def find_cycle(self) -> Optional[List[str]]:
+        """Find a dependency cycle, returned as a path whose first group is repeated last."""
+        try:
+            self._sort()
+        except CircularDependencyError as err:
+            return err.cycle
+        return None
+
+    def with_dependents(self, names: Iterable[str]) -> List[str]:
+        """Groups in names and every group depending on them, in dependency order."""
+        selected = set()
+        pending = [name for name in names if name in self.groups]
+        while pending:
+            name = pending.pop()
+            if name not in selected:
+                selected.add(name)
+                pending.extend(self.dependents[name])
+        return [name for name in self.order if name in selected]
+
+    def depths(self) -> Dict[str, int]:
+        """Length of the longest dependency chain leading to each group."""
+        depths: Dict[str, int] = {}
+        for name in self.order:
+            deps = self.dependencies[name]
+            depths[name] = 1 + max(depths[dep] for dep in deps) if deps else 0
+        return depths
+
+    def longest_chain(self) -> List[str]:
+        """Longest chain of groups each reading the previous group's output."""
+        depths = self.depths()
+        if not depths:
+            return []
+        name = max(self.order, key=lambda n: depths[n])
+        chain = [name]
+        while self.dependencies[name]:
+            name = max(self.dependencies[name], key=lambda n: depths[n])
+            chain.append(name)
+        return chain[::-1]
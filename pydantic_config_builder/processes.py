@@ -0,0 +1,43 @@
+"""Worker processes parsing and serializing YAML for pydantic-config-builder."""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict
+
+from .sorting import KeySorter
+from .yaml_backend import YamlBackend
+
+
+@lru_cache(maxsize=None)
+def _backend(name: str) -> YamlBackend:
+    """YAML backend of this worker process."""
+    return YamlBackend(name)
+
+
+@lru_cache(maxsize=None)
+def _sorter(mode: str) -> KeySorter:
+    """Key sorter of this worker process, caching sort keys across tasks."""
+    return KeySorter(mode)
+
+
+def parse(backend: str, path: Path) -> Dict[str, Any]:
+    """Parse a YAML file."""
+    return _backend(backend).load(path)
+
+
+def serialize(backend: str, sort_keys: str, config: Dict[str, Any]) -> bytes:
+    """Sort keys of a built configuration and serialize it to YAML."""
+    return _backend(backend).dump(_sorter(sort_keys).sort(config))
+
+
+def process_pool(workers: int) -> ProcessPoolExecutor:
+    """Create a pool of worker processes for parse and serialize.
+
+    Workers are forked from a separate server process where available, as
+    forking the builder itself would copy the state of its other threads.
+    Processes are started on first use.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else None)
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
@@ -0,0 +1,173 @@
+"""Build profiling for pydantic-config-builder."""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Build phases in the order they happen
+PHASES = ("config_load", "validate", "resolve", "parse", "merge", "sort", "dump", "write")
+
+# Phases attributed to a build group
+GROUP_PHASES = ("merge", "sort", "dump", "write")
+
+
+@dataclass(frozen=True)
+class PhaseEvent:
+    """One timed phase: a file parse, a group merge, a write and so on."""
+
+    phase: str
+    # File path for parse, group name for group phases, empty otherwise
+    name: str
+    # Seconds since the profiler was created
+    start: float
+    duration: float
+    thread: int
+    nbytes: int = 0
+
+
+class Span:
+    """Phase being timed; set nbytes to the number of bytes it read or wrote."""
+
+    __slots__ = ("nbytes",)
+
+    def __init__(self) -> None:
+        """Initialize span with no bytes."""
+        self.nbytes = 0
+
+
+class Profiler:
+    """Record how long each phase of a build takes and how many bytes it moves.
+
+    ConfigBuilder reports every phase through phase() and tallies such as
+    reused merges through count(). Subclasses can override record() to
+    receive events as they happen. Thread-safe.
+    """
+
+    def __init__(self) -> None:
+        """Initialize profiler without events."""
+        self.events: List[PhaseEvent] = []
+        self.counters: Dict[str, int] = {}
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, phase: str, name: str = "") -> Iterator[Span]:
+        """Time the enclosed block as a phase."""
+        span = Span()
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            end = time.perf_counter()
+            self.record(
+                PhaseEvent(
+                    phase=phase,
+                    name=name,
+                    start=start - self._origin,
+                    duration=end - start,
+                    thread=threading.get_ident(),
+                    nbytes=span.nbytes,
+                )
+            )
+
+    def record(self, event: PhaseEvent) -> None:
+        """Store a finished phase."""
+        with self._lock:
+            self.events.append(event)
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Add n to a counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def phase_totals(self) -> Dict[str, float]:
+        """Total seconds spent in each phase, in build order."""
+        totals = {phase: 0.0 for phase in PHASES}
+        for event in self.events:
+            totals[event.phase] = totals.get(event.phase, 0.0) + event.duration
+        return totals
+
+    def bytes_read(self) -> int:
+        """Bytes of source files parsed."""
+        return sum(event.nbytes for event in self.events if event.phase == "parse")
+
+    def bytes_written(self) -> int:
+        """Bytes of outputs written."""
+        return sum(event.nbytes for event in self.events if event.phase == "write")
+
+    def slowest_files(self, top: int = 10) -> List[Tuple[str, float]]:
+        """Files that took longest to parse."""
+        return self._slowest(("parse",), top)
+
+    def slowest_groups(self, top: int = 10) -> List[Tuple[str, float]]:
+        """Groups that took longest to merge, sort, dump and write."""
+        return self._slowest(GROUP_PHASES, top)
+
+    def _slowest(self, phases: Tuple[str, ...], top: int) -> List[Tuple[str, float]]:
+        totals: Dict[str, float] = {}
+        for event in self.events:
+            if event.phase in phases:
+                totals[event.name] = totals.get(event.name, 0.0) + event.duration
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+    def summary(self, top: int = 10) -> str:
+        """Human-readable table of phase totals and the slowest files and groups."""
+        counts: Dict[str, int] = {}
+        for event in self.events:
+            counts[event.phase] = counts.get(event.phase, 0) + 1
+        lines = ["Profile:"]
+        for phase, seconds in self.phase_totals().items():
+            line = f"  {phase:<12} {seconds:9.4f}s  ({counts.get(phase, 0)} calls)"
+            if phase == "parse":
+                line += f", {self.bytes_read()} bytes read"
+            elif phase == "write":
+                line += f", {self.bytes_written()} bytes written"
+            lines.append(line)
+        if self.counters:
+            lines.append("Counters:")
+            lines.extend(f"  {name:<22} {value}" for name, value in self.counters.items())
+        for title, slowest in (
+            ("Slowest files", self.slowest_files(top)),
+            ("Slowest groups", self.slowest_groups(top)),
+        ):
+            if slowest:
+                lines.append(f"{title}:")
+                lines.extend(f"  {seconds:9.4f}s  {name}" for name, seconds in slowest)
+        return "\n".join(lines)
+
+    def to_dict(self, top: int = 10) -> Dict[str, Any]:
+        """Phase totals, byte counts and slowest files and groups as plain data."""
+        return {
+            "phases": self.phase_totals(),
+            "bytes_read": self.bytes_read(),
+            "bytes_written": self.bytes_written(),
+            "counters": dict(self.counters),
+            "slowest_files": [list(item) for item in self.slowest_files(top)],
+            "slowest_groups": [list(item) for item in self.slowest_groups(top)],
+        }
+
+    def write_trace(self, path: Path, top: int = 10) -> None:
+        """Write events in Chrome trace format, with the summary, to a JSON file.
+
+        The file can be opened in chrome://tracing or Perfetto.
+        """
+        trace = {
+            "traceEvents": [
+                {
+                    "name": f"{event.phase} {event.name}".rstrip(),
+                    "cat": event.phase,
+                    "ph": "X",
+                    "ts": event.start * 1e6,
+                    "dur": event.duration * 1e6,
+                    "pid": 0,
+                    "tid": event.thread,
+                    "args": {"bytes": event.nbytes},
+                }
+                for event in self.events
+            ],
+            "summary": self.to_dict(top),
+        }
+        path.write_text(json.dumps(trace, indent=2))
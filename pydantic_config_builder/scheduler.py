@@ -0,0 +1,62 @@
+"""Dependency-ordered scheduling of build groups."""
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Collection, Dict, List, Optional
+
+from .plan import BuildPlan
+
+
+def topological_order(plan: BuildPlan) -> List[str]:
+    """Order groups so every group comes after the groups it depends on."""
+    return plan.order
+
+
+def run_in_dependency_order(
+    plan: BuildPlan,
+    task: Callable[[str], None],
+    jobs: int = 1,
+    groups: Optional[Collection[str]] = None,
+) -> None:
+    """Run task for every group once all groups it depends on have finished.
+
+    With groups given, only those groups are run; dependencies outside of
+    them are treated as finished. With jobs greater than one, independent
+    groups run concurrently on a thread pool. The first exception raised by
+    a task stops scheduling of further groups and is re-raised once running
+    tasks have finished.
+    """
+    order = topological_order(plan)
+    if groups is not None:
+        order = [name for name in order if name in groups]
+    if jobs <= 1:
+        for name in order:
+            task(name)
+        return
+
+    selected = set(order)
+    waiting: Dict[str, int] = {
+        name: sum(dep in selected for dep in plan.dependencies[name]) for name in order
+    }
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        running: Dict["Future[None]", str] = {}
+
+        def submit_ready() -> None:
+            for name in order:
+                if waiting.get(name) == 0:
+                    del waiting[name]
+                    running[executor.submit(task, name)] = name
+
+        submit_ready()
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    for other in running:
+                        other.cancel()
+                    wait(running)
+                    raise error
+                for dependent in plan.dependents[name]:
+                    if dependent in waiting:
+                        waiting[dependent] -= 1
+            submit_ready()
@@ -0,0 +1,179 @@
+"""Long-running build server for pydantic-config-builder."""
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Set
+
+from .builder import ConfigBuilder
+from .config import ConfigModel
+from .watch import Snapshot, affected_groups, take_snapshot, watched_paths
+
+
+class BuildServer:
+    """Serve build requests from a warm ConfigBuilder over a Unix socket.
+
+    The builder's resolved plan, parsed sources and built configurations are
+    kept between requests. Before each request, the signatures of all sources,
+    the directories glob patterns match in and the configuration file are
+    compared with those seen last: changed groups and their dependents are
+    rebuilt, and a changed configuration file is reloaded with reload_config.
+
+    Requests and responses are JSON objects, one per line:
+
+    - ``{"command": "build", "groups": [...]}`` builds all or the given
+      groups and returns the written, unchanged and skipped outputs.
+    - ``{"command": "get", "output": "path", "format": "json"}`` returns the
+      merged configuration of an output without writing it, as an object or,
+      with format yaml, as the YAML text that would be written.
+    - ``{"command": "stats"}`` returns cache statistics.
+    - ``{"command": "ping"}`` and ``{"command": "shutdown"}``.
+
+    Responses have ``"ok": true``, or ``"ok": false`` and an ``"error"``.
+    Requests are handled one at a time.
+    """
+
+    def __init__(
+        self,
+        builder: ConfigBuilder,
+        socket_path: Path,
+        config_path: Optional[Path] = None,
+        reload_config: Optional[Callable[[], ConfigModel]] = None,
+    ):
+        """Initialize server for a builder; call serve_forever to start serving."""
+        self.builder = builder
+        self.socket_path = socket_path
+        self.config_path = config_path
+        self.reload_config = reload_config
+        self.requests = 0
+        self._files: Set[Path] = set()
+        self._dirs: Set[Path] = set()
+        self._snapshot: Optional[Snapshot] = None
+        self._lock = threading.Lock()
+        self._server: Optional[socketserver.UnixStreamServer] = None
+
+    def refresh(self) -> None:
+        """Invalidate whatever changed on disk since the last request."""
+        if self._snapshot is None:
+            self._watch()
+            return
+
+        snapshot = take_snapshot(self._files, self._dirs)
+        changed = {p for p in self._snapshot if self._snapshot[p] != snapshot.get(p)}
+        if not changed:
+            return
+
+        builder = self.builder
+        if self.config_path in changed and self.reload_config is not None:
+            builder.config = self.reload_config()
+            builder.invalidate_plan()
+            builder.built_configs.clear()
+            self._watch()
+        elif any(p in self._dirs for p in changed):
+            builder.invalidate_groups(affected_groups(builder, changed, True))
+            self._watch()
+        else:
+            builder.invalidate_groups(affected_groups(builder, changed, False))
+            self._snapshot = snapshot
+
+    def _watch(self) -> None:
+        """Find the paths the current plan depends on and record their signatures."""
+        self._files, self._dirs = watched_paths(self.builder, self.config_path)
+        self._snapshot = take_snapshot(self._files, self._dirs)
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle one request, returning the response."""
+        with self._lock:
+            self.requests += 1
+            try:
+                return {"ok": True, **self._dispatch(request)}
+            except Exception as err:
+                return {"ok": False, "error": str(err)}
+
+    def _dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        command = request.get("command")
+        if command == "ping":
+            return {}
+        if command == "shutdown":
+            if self._server is not None:
+                # shutdown() waits for serve_forever, so it must not run on its thread
+                threading.Thread(target=self._server.shutdown).start()
+            return {}
+        if command == "stats":
+            cache = self.builder.source_cache
+            return {
+                "requests": self.requests,
+                "groups": len(self.builder.plan.groups),
+                "built_configs": len(self.builder.built_configs),
+                "source_cache": {"entries": len(cache), "hits": cache.hits, "misses": cache.misses},
+            }
+
+        self.refresh()
+        builder = self.builder
+        if command == "build":
+            groups = request.get("groups")
+            if groups is not None:
+                unknown = [name for name in groups if name not in builder.plan.groups]
+                if unknown:
+                    raise ValueError(f"Unknown groups: {', '.join(unknown)}")
+            builder.build_all(groups)
+            return {
+                "written": [str(p) for p in builder.written_outputs],
+                "unchanged": [str(p) for p in builder.unchanged_outputs],
+                "skipped": [str(p) for p in builder.skipped_outputs],
+            }
+        if command == "get":
+            if "output" not in request:
+                raise ValueError("Missing output")
+            output = builder.config.resolve_path(str(request["output"]), builder.base_dir)
+            sources = builder.plan.output_sources.get(output)
+            if sources is None:
+                raise ValueError(f"Not an output of any group: {output}")
+            config = builder.build_config(output, sources)
+            if request.get("format", "json") == "yaml":
+                return {"config": builder.serialize(config).decode("utf-8")}
+            return {"config": config}
+        raise ValueError(f"Unknown command: {command}")
+
+    def serve_forever(self) -> None:
+        """Listen on the socket and handle requests until a shutdown request."""
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for line in self.rfile:
+                    try:
+                        request = json.loads(line)
+                        if not isinstance(request, dict):
+                            raise ValueError("Request must be a JSON object")
+                    except ValueError as err:
+                        response: Dict[str, Any] = {"ok": False, "error": f"Bad request: {err}"}
+                    else:
+                        response = server.handle(request)
+                    try:
+                        # Values JSON cannot represent, such as dates, are sent as strings
+                        data = json.dumps(response, default=str)
+                    except (TypeError, ValueError) as err:
+                        data = json.dumps({"ok": False, "error": f"Cannot encode response: {err}"})
+                    self.wfile.write(data.encode() + b"\n")
+                    self.wfile.flush()
+
+        if self.socket_path.exists() and stat.S_ISSOCK(self.socket_path.stat().st_mode):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.connect(str(self.socket_path))
+                except ConnectionRefusedError:
+                    # Replace the socket of a server that did not shut down cleanly
+                    os.unlink(self.socket_path)
+                else:
+                    raise FileExistsError(f"Server already running on {self.socket_path}")
+        with socketserver.UnixStreamServer(str(self.socket_path), Handler) as unix_server:
+            self._server = unix_server
+            try:
+                unix_server.serve_forever()
+            finally:
+                self._server = None
+                os.unlink(self.socket_path)
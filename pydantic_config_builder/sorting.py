@@ -0,0 +1,92 @@
+"""Key ordering of built configurations."""
+import re
+from typing import Any, Dict, List
+
+SORT_MODES = ("natural", "recursive", "none")
+
+_DIGITS = re.compile("([0-9]+)")
+_DIGIT_RUN = re.compile("[0-9]+")
+
+
+def natural_sort_key(key: Any) -> List[Any]:
+    """Convert string into list of string and number chunks for natural sorting.
+    Temporarily appends .yaml to the key for sorting purposes."""
+    # Splitting on a capturing group puts the digit runs at the odd indexes
+    chunks: List[Any] = _DIGITS.split(f"{key}.yaml")
+    chunks[::2] = [text.lower() for text in chunks[::2]]
+    chunks[1::2] = [int(text) for text in chunks[1::2]]
+    return chunks
+
+
+def _encode_number(match: "re.Match[str]") -> str:
+    """Encode a digit run so numbers compare by value: end of text, length, digits."""
+    digits = match.group().lstrip("0")
+    return "\0\0" + chr(len(digits)) + digits
+
+
+def compact_sort_key(key: Any) -> str:
+    """Encode the natural sort key of a key as one string that compares the same.
+
+    Text chunks end with two NULs (NULs in them are escaped as NUL, SOH) and
+    numbers are prefixed with their length, so comparing the strings compares
+    chunk by chunk like natural_sort_key, but without building a list.
+    """
+    text = f"{key}.yaml".lower().replace("\0", "\0\1")
+    return _DIGIT_RUN.sub(_encode_number, text) + "\0\0"
+
+
+class KeySorter:
+    """Order mapping keys of built configurations.
+
+    The natural mode sorts top-level keys naturally and keeps nested order,
+    recursive sorts the keys of every nested mapping too and none keeps the
+    merged order. Sort keys of strings are cached, so keys shared by many
+    outputs or seen again in later builds are converted once.
+    """
+
+    def __init__(self, mode: str = "natural"):
+        """Initialize sorter by mode (natural, recursive or none)."""
+        if mode not in SORT_MODES:
+            raise ValueError(f"Unknown key sort mode: {mode}")
+        self.mode = mode
+        self._keys: Dict[str, str] = {}
+
+    def sort_key(self, key: Any) -> str:
+        """Get the natural sort key of a mapping key."""
+        # Only strings are cached: 1, 1.0 and True are equal but sort differently
+        if not isinstance(key, str):
+            return compact_sort_key(key)
+        cached = self._keys.get(key)
+        if cached is None:
+            cached = self._keys[key] = compact_sort_key(key)
+        return cached
+
+    def keys(self, data: Dict[Any, Any]) -> List[Any]:
+        """Get the top-level keys of a mapping in output order."""
+        if self.mode == "none":
+            return list(data)
+        return sorted(data, key=self.sort_key)
+
+    def sort(self, data: Dict[Any, Any]) -> Dict[Any, Any]:
+        """Get a mapping with its keys in output order; values are not copied."""
+        if self.mode == "recursive":
+            return self._sort_nested(data, {})
+        if self.mode == "none":
+            return data
+        return {key: data[key] for key in self.keys(data)}
+
+    def _sort_nested(self, value: Any, memo: Dict[int, Any]) -> Any:
+        """Sort the keys of all mappings in value, keeping shared objects shared."""
+        if not isinstance(value, (dict, list)):
+            return value
+        if id(value) in memo:
+            return memo[id(value)]
+        result: Any
+        if isinstance(value, dict):
+            result = memo[id(value)] = {}
+            for key in sorted(value, key=self.sort_key):
+                result[key] = self._sort_nested(value[key], memo)
+        else:
+            result = memo[id(value)] = []
+            result.extend(self._sort_nested(item, memo) for item in value)
+        return result
@@ -0,0 +1,248 @@
+"""Watch mode for pydantic-config-builder."""
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .builder import ConfigBuilder
+from .cache import FileSignature, file_signature
+from .config import ConfigModel
+from .globindex import has_magic
+
+# Signature of every watched file and directory, None if it does not exist
+Snapshot = Dict[Path, Optional[FileSignature]]
+
+# IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+# IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+_INOTIFY_MASK = 0x002 | 0x004 | 0x008 | 0x040 | 0x080 | 0x100 | 0x200 | 0x400 | 0x800
+
+
+def _signature(path: Path) -> Optional[FileSignature]:
+    """Get the signature of a path, None if it does not exist."""
+    try:
+        return file_signature(path)
+    except OSError:
+        return None
+
+
+def _glob_dirs(pattern: Path) -> Iterable[Path]:
+    """Directories whose entries can change what a glob pattern matches."""
+    parts = pattern.parts
+    first = next(i for i, part in enumerate(parts) if has_magic(part))
+    root = Path(*parts[:first]) if first else Path(".")
+    yield root
+    # Magic in a directory component (including **) can match any subdirectory
+    if first < len(parts) - 1:
+        for dirpath, dirnames, _ in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for dirname in dirnames:
+                yield Path(dirpath) / dirname
+
+
+def watched_paths(
+    builder: ConfigBuilder, config_path: Optional[Path] = None
+) -> Tuple[Set[Path], Set[Path]]:
+    """Get the files and directories whose changes can affect the build.
+
+    Files are all sources that are not outputs of another group, plus the
+    configuration file. Directories are those containing the files and every
+    directory a glob pattern can match in.
+    """
+    plan = builder.plan
+    files = {
+        src_path
+        for group in plan.groups.values()
+        for src_path in group.sources
+        if src_path not in plan.output_paths
+    }
+    dirs: Set[Path] = set()
+    for build_config in builder.config.builds.values():
+        for pattern in build_config.input:
+            path = builder.config.resolve_path(pattern, builder.base_dir)
+            if has_magic(pattern):
+                dirs.update(_glob_dirs(path))
+            else:
+                dirs.add(path.parent)
+    if config_path is not None:
+        files.add(config_path)
+    dirs.update(path.parent for path in files)
+    # Watch the nearest existing ancestor of missing directories to see them appear
+    for path in list(dirs):
+        while not path.is_dir() and path.parent != path:
+            path = path.parent
+            dirs.add(path)
+    return files, dirs
+
+
+def take_snapshot(files: Iterable[Path], dirs: Iterable[Path]) -> Snapshot:
+    """Record the signatures of files and directories."""
+    snapshot: Snapshot = {path: _signature(path) for path in files}
+    snapshot.update((path, _signature(path)) for path in dirs)
+    return snapshot
+
+
+class PollingWatcher:
+    """Detect changes by comparing snapshots at a fixed interval."""
+
+    def __init__(self, interval: float = 0.5):
+        """Initialize watcher with the polling interval in seconds."""
+        self.interval = interval
+        self._files: Set[Path] = set()
+        self._dirs: Set[Path] = set()
+        self._snapshot: Snapshot = {}
+
+    def watch(self, files: Set[Path], dirs: Set[Path]) -> None:
+        """Set the watched files and directories."""
+        self._files, self._dirs = files, dirs
+        self._snapshot = take_snapshot(files, dirs)
+
+    def wait(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for a change; True if something changed."""
+        deadline = time.monotonic() + timeout
+        while True:
+            time.sleep(max(0.0, min(self.interval, deadline - time.monotonic())))
+            snapshot = take_snapshot(self._files, self._dirs)
+            if snapshot != self._snapshot:
+                self._snapshot = snapshot
+                return True
+            if time.monotonic() >= deadline:
+                return False
+
+    def close(self) -> None:
+        """Release resources."""
+
+
+class InotifyWatcher:
+    """Detect changes with Linux inotify watches on directories."""
+
+    def __init__(self) -> None:
+        """Initialize inotify; raises OSError if it is not available."""
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._watches: Dict[Path, int] = {}
+
+    def watch(self, files: Set[Path], dirs: Set[Path]) -> None:
+        """Set the watched directories; files are covered by their directories."""
+        for path in list(self._watches):
+            if path not in dirs:
+                self._libc.inotify_rm_watch(self._fd, self._watches.pop(path))
+        for path in dirs:
+            if path not in self._watches:
+                wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), _INOTIFY_MASK)
+                if wd >= 0:
+                    self._watches[path] = wd
+
+    def wait(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for a change; True if something changed."""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return False
+        # Events only wake us up; what changed is found by comparing snapshots
+        while True:
+            try:
+                if not os.read(self._fd, 65536):
+                    break
+            except BlockingIOError:
+                break
+        return True
+
+    def close(self) -> None:
+        """Release the inotify file descriptor."""
+        os.close(self._fd)
+
+
+def create_watcher(
+    poll_interval: float = 0.5, use_inotify: bool = True
+) -> Union[PollingWatcher, InotifyWatcher]:
+    """Create an inotify watcher where available, a polling watcher otherwise."""
+    if use_inotify and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(poll_interval)
+
+
+def affected_groups(builder: ConfigBuilder, changed: Set[Path], dirs_changed: bool) -> List[str]:
+    """Get groups whose sources changed, re-resolving globs if directories changed."""
+    old_sources = {name: group.sources for name, group in builder.plan.groups.items()}
+    if dirs_changed:
+        builder.invalidate_plan()
+    return [
+        name
+        for name, group in builder.plan.groups.items()
+        if old_sources.get(name) != group.sources or any(p in changed for p in group.sources)
+    ]
+
+
+def watch(
+    builder: ConfigBuilder,
+    config_path: Optional[Path] = None,
+    reload_config: Optional[Callable[[], ConfigModel]] = None,
+    poll_interval: float = 0.5,
+    debounce: float = 0.2,
+    use_inotify: bool = True,
+    stop: Optional[threading.Event] = None,
+) -> None:
+    """Build all configurations, then rebuild affected groups whenever sources change.
+
+    Changed sources and changed glob matches rebuild the groups reading them
+    and every group depending on those, reusing the builder's plan and parsed
+    sources for everything else. Bursts of changes are collected until
+    nothing changes for debounce seconds. If the configuration file changes,
+    it is reloaded with reload_config and everything is rebuilt. Runs until
+    stop is set.
+    """
+    watcher = create_watcher(poll_interval, use_inotify)
+    try:
+        failed: Set[str] = set()
+        groups: Optional[List[str]] = None
+        while True:
+            # Snapshot before building so changes made during the build are seen next
+            files, dirs = watched_paths(builder, config_path)
+            snapshot = take_snapshot(files, dirs)
+            watcher.watch(files, dirs)
+
+            if groups is None or groups:
+                try:
+                    builder.build_all(groups)
+                    failed.clear()
+                except Exception as err:
+                    print(f"Build failed: {err}")
+                    failed.update(builder.plan.groups if groups is None else groups)
+
+            while not watcher.wait(poll_interval):
+                if stop is not None and stop.is_set():
+                    return
+            while watcher.wait(debounce):
+                pass
+
+            new_snapshot = take_snapshot(files, dirs)
+            changed = {p for p in snapshot if snapshot[p] != new_snapshot.get(p)}
+            if config_path is not None and config_path in changed and reload_config is not None:
+                try:
+                    builder.config = reload_config()
+                except Exception as err:
+                    print(f"Failed to reload configuration: {err}")
+                    groups = []
+                    continue
+                print("\nConfiguration changed, rebuilding all groups")
+                builder.invalidate_plan()
+                builder.built_configs.clear()
+                groups = None
+                continue
+
+            names = affected_groups(builder, changed, any(p in dirs for p in changed))
+            groups = builder.invalidate_groups(set(names) | (failed & set(builder.plan.groups)))
+            if groups:
+                print(f"\nRebuilding {', '.join(groups)}")
+    finally:
+        watcher.close()
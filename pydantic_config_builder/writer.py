@@ -0,0 +1,143 @@
+"""Output writing for pydantic-config-builder."""
+import os
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Optional, Tuple
+
+
+def _new_file_mode() -> int:
+    """Get the permission bits a newly created file would get."""
+    # Reading the umask means setting it, so only do it once, at import time
+    # before writer threads start, never while other threads create files
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+_NEW_FILE_MODE = _new_file_mode()
+
+
+def has_content(path: Path, data: bytes) -> bool:
+    """Check whether a file exists with exactly the given content."""
+    try:
+        # Compare sizes first so most changed files are detected without reading them
+        if os.stat(path).st_size != len(data):
+            return False
+        with open(path, "rb") as f:
+            return f.read() == data
+    except FileNotFoundError:
+        return False
+
+
+def has_chunks(path: Path, chunks: Iterable[bytes]) -> bool:
+    """Check whether a file exists with exactly the content of chunks.
+
+    Stops at the first chunk that differs, so later chunks are not produced.
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return False
+    with f:
+        for chunk in chunks:
+            if f.read(len(chunk)) != chunk:
+                return False
+        return f.read(1) == b""
+
+
+def read_chunks(path: Path, size: int = 1 << 20) -> Iterator[bytes]:
+    """Read a file in chunks of at most size bytes."""
+    with open(path, "rb") as f:
+        yield from iter(lambda: f.read(size), b"")
+
+
+def _prepare_target(path: Path) -> Tuple[Path, int]:
+    """Resolve symbolic links, create the directory and get the mode to write with."""
+    target = Path(os.path.realpath(path))
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = os.stat(target).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = _NEW_FILE_MODE
+    return target, mode
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """Write data to a file unless it already has exactly that content.
+
+    The file is written to a temporary file in the same directory and renamed
+    over the target, so readers never see a partially written file. Symbolic
+    links are followed and the permission bits of an existing file are kept.
+
+    Returns True if the file was written, False if it was left untouched.
+    """
+    if has_content(path, data):
+        return False
+
+    target, mode = _prepare_target(path)
+    fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, target)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return True
+
+
+def write_stream_if_changed(path: Path, chunks: Iterable[bytes]) -> bool:
+    """Write chunks to a file unless it already has exactly their content.
+
+    Like write_if_changed, but only one chunk is held in memory at a time:
+    chunks are compared with the current content first, and a temporary file
+    is only created at the first chunk that differs, starting with a copy of
+    the matching part of the current file. Unchanged files thus leave their
+    directory untouched.
+
+    Returns True if the file was written, False if it was left untouched.
+    """
+    chunks = iter(chunks)
+    try:
+        current: Optional[BinaryIO] = open(path, "rb")
+    except FileNotFoundError:
+        current = None
+    try:
+        matched = 0
+        differing = b""
+        if current is not None:
+            for chunk in chunks:
+                if current.read(len(chunk)) != chunk:
+                    differing = chunk
+                    break
+                matched += len(chunk)
+            else:
+                if current.read(1) == b"":
+                    return False
+
+        target, mode = _prepare_target(path)
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                if current is not None:
+                    current.seek(0)
+                    while matched > 0:
+                        block = current.read(min(matched, 1 << 20))
+                        if not block:
+                            raise OSError(f"{path} was truncated while being compared")
+                        f.write(block)
+                        matched -= len(block)
+                    current.close()
+                f.write(differing)
+                for chunk in chunks:
+                    f.write(chunk)
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, target)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    finally:
+        if current is not None:
+            current.close()
+    return True
@@ -0,0 +1,127 @@
+"""YAML parsing and serialization backends."""
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import yaml
+
+BACKENDS = ("auto", "c", "python")
+
+HAS_LIBYAML: bool = getattr(yaml, "__with_libyaml__", False)
+
+# Characters both emitters write the same way. libyaml differs from the pure
+# Python emitter for control characters, NEL, NBSP, BOM, line/paragraph
+# separators and characters outside the BMP.
+_UNSAFE_CHARS = re.compile("[^\t\n\x20-\x7e\xa1-\u2027\u202a-\ud7ff\ue000-\ufefe\uff00-\ufffd]")
+
+# Longest key (in UTF-8 bytes) both emitters write as a simple key. libyaml
+# allows 128 bytes, while Python requires fewer than 128 characters counting
+# the implicit !!str or !!int tag (5 characters) it prepares for the key.
+_MAX_SIMPLE_KEY_BYTES = 122
+
+
+def _is_c_safe_string(value: str, is_key: bool) -> bool:
+    """Check whether libyaml writes a string exactly like the Python emitter."""
+    if _UNSAFE_CHARS.search(value):
+        return False
+    if is_key:
+        return value != "" and "\n" not in value and len(value.encode()) <= _MAX_SIMPLE_KEY_BYTES
+    return True
+
+
+def is_c_safe(data: Any, is_key: bool = False) -> bool:
+    """Check whether libyaml serializes data byte-identically to the Python emitter."""
+    if isinstance(data, str):
+        return _is_c_safe_string(data, is_key)
+    if is_key and isinstance(data, int):
+        return len(str(data)) <= _MAX_SIMPLE_KEY_BYTES
+    if isinstance(data, dict):
+        return all(is_c_safe(k, True) and is_c_safe(v) for k, v in data.items())
+    if isinstance(data, (list, tuple, set)):
+        return all(is_c_safe(v, is_key) for v in data)
+    return True
+
+
+def _ignores_aliases(data: Any) -> bool:
+    """Check whether emitters write data in full even if it occurs twice."""
+    return data is None or data == () or isinstance(data, (str, bytes, bool, int, float))
+
+
+def has_shared_values(data: Any) -> bool:
+    """Check whether a non-scalar object occurs more than once in data.
+
+    Emitters write such objects with an anchor the first time and as an
+    alias afterwards.
+    """
+    seen = set()
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if _ignores_aliases(value):
+            continue
+        if id(value) in seen:
+            return True
+        seen.add(id(value))
+        if isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple, set)):
+            stack.extend(value)
+    return False
+
+
+class YamlBackend:
+    """YAML loader and dumper using libyaml when available.
+
+    The auto backend uses libyaml if PyYAML was compiled with it and the
+    pure Python implementation otherwise. Serialized output is identical for
+    every backend: data libyaml would write differently is always written by
+    the Python emitter.
+    """
+
+    def __init__(self, name: str = "auto"):
+        """Initialize backend by name (auto, c or python)."""
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown YAML backend: {name}")
+        if name == "c" and not HAS_LIBYAML:
+            raise ValueError("YAML backend 'c' requested but PyYAML was built without libyaml")
+        self.name = name
+        self.use_libyaml = name == "c" or (name == "auto" and HAS_LIBYAML)
+
+    def load(self, file_path: Path) -> Dict[str, Any]:
+        """Load YAML file."""
+        loader = yaml.CSafeLoader if self.use_libyaml else yaml.SafeLoader
+        with open(file_path, "r", encoding="utf-8") as f:
+            return yaml.load(f, Loader=loader) or {}
+
+    def dump(self, data: Any) -> bytes:
+        """Serialize data to YAML bytes."""
+        # Python ends documents with a bare scalar root with an explicit "..."
+        if self.use_libyaml and isinstance(data, dict) and is_c_safe(data):
+            # libyaml disables line wrapping with a negative width
+            text = yaml.dump(
+                data, Dumper=yaml.CSafeDumper, sort_keys=False, allow_unicode=True, width=-1
+            )
+        else:
+            text = yaml.dump(
+                data,
+                Dumper=yaml.SafeDumper,
+                sort_keys=False,
+                allow_unicode=True,
+                width=float("inf"),
+            )
+        return text.encode("utf-8")
+
+    def dump_items(self, data: Dict[Any, Any], keys: List[Any]) -> Iterator[bytes]:
+        """Serialize a mapping one entry at a time, in the order of keys.
+
+        The chunks joined are identical to dump() of the mapping with that key
+        order, but only one entry is serialized at a time. Empty mappings and
+        mappings with shared values, which need anchors spanning entries, are
+        serialized as a single chunk.
+        """
+        if not keys or has_shared_values(data):
+            yield self.dump({key: data[key] for key in keys})
+            return
+        for key in keys:
+            yield self.dump({key: data[key]})
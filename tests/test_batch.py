@@ -0,0 +1,97 @@
+"""Tests for building several configurations."""
+import pytest
+import yaml
+
+from pydantic_config_builder.batch import ConfigBuildError, build_configs, discover_configs
+from pydantic_config_builder.builder import ConfigBuilder
+from pydantic_config_builder.config import BuildConfig, ConfigModel
+from pydantic_config_builder.globindex import GlobIndex
+from pydantic_config_builder.incremental import CACHE_DIR_NAME, MANIFEST_FILE_NAME
+from pydantic_config_builder.options import BuildOptions
+
+
+def _service(root, name, inputs):
+    """Create a service directory with a configuration building out.yaml."""
+    config = ConfigModel(builds={name: BuildConfig(input=inputs, output=["out.yaml"])})
+    (root / name).mkdir(parents=True, exist_ok=True)
+    (root / name / "pydantic-config-builder.yml").write_text(
+        yaml.dump({name: {"input": inputs, "output": ["out.yaml"]}})
+    )
+    return root / name / "pydantic-config-builder.yml", config
+
+
+def test_discover_configs(tmp_path):
+    """Test finding configuration files, preferring .yaml and skipping hidden directories."""
+    for path in [
+        "a/pydantic-config-builder.yml",
+        "b/c/pydantic-config-builder.yaml",
+        "b/c/pydantic-config-builder.yml",
+        ".git/pydantic-config-builder.yml",
+        "d/other.yml",
+    ]:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text("{}")
+
+    assert discover_configs(tmp_path) == [
+        tmp_path / "a/pydantic-config-builder.yml",
+        tmp_path / "b/c/pydantic-config-builder.yaml",
+    ]
+
+
+def test_build_configs_shares_caches(tmp_path):
+    """Test that shared sources are parsed once and later configurations see new outputs."""
+    (tmp_path / "shared").mkdir()
+    (tmp_path / "shared" / "base.yaml").write_text("a: 1\n")
+    first, first_config = _service(tmp_path, "first", ["../shared/base.yaml"])
+    second, second_config = _service(tmp_path, "second", ["../shared/base.yaml", "../*/out.yaml"])
+
+    index = GlobIndex()
+    builder1 = ConfigBuilder(first_config, first.parent, glob_index=index)
+    builder2 = ConfigBuilder(
+        second_config, second.parent, source_cache=builder1.source_cache, glob_index=index
+    )
+    # The index lists the service directories before the first output exists
+    sources = builder2.plan.groups["second"].sources
+    assert [p.resolve() for p in sources] == [tmp_path / "shared" / "base.yaml"]
+    builder2.invalidate_plan()
+
+    build_configs({first: builder1, second: builder2})
+
+    assert builder1.source_cache.misses == 2
+    assert builder1.source_cache.hits == 1
+    sources = builder2.plan.groups["second"].sources
+    assert tmp_path / "first" / "out.yaml" in [p.resolve() for p in sources]
+
+
+def test_build_configs_error(tmp_path):
+    """Test that errors name the configuration file that failed."""
+    path, config = _service(tmp_path, "broken", ["missing.yaml"])
+
+    with pytest.raises(ConfigBuildError, match="pydantic-config-builder.yml") as info:
+        build_configs({path: ConfigBuilder(config, path.parent)}, jobs=2)
+    assert info.value.config_path == path
+
+
+def test_build_configs_share_manifest(tmp_path):
+    """Test that configurations sharing a directory keep their manifest entries in parallel."""
+    (tmp_path / "base.yaml").write_text("a: 1\n")
+    configs = {
+        tmp_path
+        / f"cfg_{i}.yaml": ConfigModel(
+            builds={f"g{i}": BuildConfig(input=["base.yaml"], output=[f"out{i}.yaml"])}
+        )
+        for i in range(8)
+    }
+
+    for rebuilt, skipped in [(1, 0), (0, 1)]:
+        builders = {
+            path: ConfigBuilder(config, tmp_path, options=BuildOptions(incremental=True))
+            for path, config in configs.items()
+        }
+        build_configs(builders, jobs=4)
+        for builder in builders.values():
+            assert (len(builder.rebuilt_outputs), len(builder.skipped_outputs)) == (
+                rebuilt,
+                skipped,
+            )
+    assert [p.name for p in (tmp_path / CACHE_DIR_NAME).iterdir()] == [MANIFEST_FILE_NAME]
@@ -0,0 +1,51 @@
+"""Tests for the benchmark harness."""
+import json
+
+from click.testing import CliRunner
+
+from benchmarks.run import _load, _merge, _merge_all, _merge_memo, main
+from benchmarks.workloads import WORKLOADS
+from pydantic_config_builder.builder import ConfigBuilder
+
+
+def test_workloads_build(tmp_path):
+    """Test that every workload generates a buildable configuration."""
+    for name, workload in WORKLOADS.items():
+        root = tmp_path / name
+        config = workload(root, 1)
+        ConfigBuilder(config, root).build_all()
+        assert all((root / p).exists() for b in config.builds.values() for p in b.output)
+
+
+def test_run_outputs_json(tmp_path):
+    """Test that timings of every stage are written as JSON."""
+    output = tmp_path / "bench.json"
+    runner = CliRunner()
+    result = runner.invoke(main, ["-w", "long_chain", "-r", "2", "-j", "2", "-o", str(output)])
+
+    assert result.exit_code == 0
+    data = json.loads(output.read_text())
+    stages = data["workloads"]["long_chain"]["stages"]
+    assert list(stages) == [
+        "resolve",
+        "load",
+        "merge",
+        "merge_all",
+        "merge_memo",
+        "sort",
+        "dump",
+        "build",
+        "build_jobs",
+    ]
+    assert all(len(stage["runs"]) == 2 for stage in stages.values())
+
+
+def test_merge_stages_identical(tmp_path):
+    """Test that the merge stages being compared produce the same configurations."""
+    for name, workload in WORKLOADS.items():
+        root = tmp_path / name
+        resolved = workload(root, 1).get_resolved_config(root)
+        loaded = _load(resolved)
+        expected = _merge(resolved, loaded)
+        assert _merge_all(resolved, loaded) == expected
+        assert _merge_memo(resolved, loaded) == expected
@@ -1,9 +1,14 @@
 """Tests for ConfigBuilder."""
+import os
+
 import pytest
 import yaml
 
 from pydantic_config_builder.builder import ConfigBuilder
 from pydantic_config_builder.config import BuildConfig, ConfigModel
+from pydantic_config_builder.options import BuildOptions
+from pydantic_config_builder.pipeline import IOPipeline
+from pydantic_config_builder.plan import CircularDependencyError
 
 
 @pytest.fixture
@@ -133,3 +138,446 @@ def test_build_with_built_config(temp_dir):
         assert "first" in result
         assert "database" in result
         assert "logging" in result
+
+
+def test_build_chain_without_existing_output(temp_dir):
+    """Test that an upstream output is built in memory before it exists on disk."""
+    config = ConfigModel(
+        builds={
+            "production": BuildConfig(
+                input=[str(temp_dir / "default.yaml"), str(temp_dir / "overlay.yaml")],
+                output=[str(temp_dir / "prod.yaml")],
+            ),
+            "development": BuildConfig(
+                input=[str(temp_dir / "base.yaml")],
+                output=[str(temp_dir / "default.yaml")],
+            ),
+        }
+    )
+
+    builder = ConfigBuilder(config=config, base_dir=temp_dir)
+    builder.build_all()
+
+    with open(temp_dir / "prod.yaml") as f:
+        result = yaml.safe_load(f)
+    assert result["database"]["host"] == "localhost"
+    assert result["database"]["port"] == 5433
+
+
+def test_plan_is_reused(temp_dir):
+    """Test that the plan is resolved once and can be invalidated."""
+    config = ConfigModel(
+        builds={
+            "test": BuildConfig(
+                input=[str(temp_dir / "*.yaml")],
+                output=[str(temp_dir / "out" / "output.yaml")],
+            )
+        }
+    )
+
+    builder = ConfigBuilder(config=config, base_dir=temp_dir)
+    plan = builder.plan
+    assert builder.plan is plan
+    assert len(plan.groups["test"].sources) == 2
+
+    (temp_dir / "extra.yaml").write_text("extra: 1\n")
+    assert len(builder.plan.groups["test"].sources) == 2
+
+    builder.invalidate_plan()
+    assert builder.plan is not plan
+    assert len(builder.plan.groups["test"].sources) == 3
+
+
+def test_shared_source_parsed_once(temp_dir):
+    """Test that a source shared by several groups is parsed once."""
+    config = ConfigModel(
+        builds={
+            f"group{i}": BuildConfig(
+                input=[str(temp_dir / "base.yaml"), str(temp_dir / "overlay.yaml")],
+                output=[str(temp_dir / f"output{i}.yaml")],
+            )
+            for i in range(3)
+        }
+    )
+
+    builder = ConfigBuilder(config=config, base_dir=temp_dir)
+    builder.build_all()
+
+    assert builder.source_cache.misses == 2
+    assert builder.source_cache.hits == 4
+    with open(temp_dir / "base.yaml") as f:
+        assert builder.source_cache.load(temp_dir / "base.yaml") == yaml.safe_load(f)
+
+
+def test_unchanged_output_not_rewritten(temp_dir):
+    """Test that outputs with identical content are left untouched."""
+    config = ConfigModel(
+        builds={
+            "test": BuildConfig(
+                input=[str(temp_dir / "base.yaml")],
+                output=[str(temp_dir / "output.yaml")],
+            )
+        }
+    )
+    ConfigBuilder(config=config, base_dir=temp_dir).build_all()
+    os.utime(temp_dir / "output.yaml", ns=(0, 0))
+
+    builder = ConfigBuilder(config=config, base_dir=temp_dir)
+    builder.build_all()
+
+    assert builder.written_outputs == []
+    assert builder.unchanged_outputs == [temp_dir / "output.yaml"]
+    assert (temp_dir / "output.yaml").stat().st_mtime_ns == 0
+
+
+def test_group_built_once(temp_dir, monkeypatch):
+    """Test that a group with several outputs is merged and serialized once."""
+    config = ConfigModel(
+        builds={
+            "test": BuildConfig(
+                input=[str(temp_dir / "base.yaml"), str(temp_dir / "overlay.yaml")],
+                output=[str(temp_dir / f"output{i}.yaml") for i in range(3)],
+            ),
+            "chained": BuildConfig(
+                input=[str(temp_dir / "output2.yaml")],
+                output=[str(temp_dir / "chained.yaml")],
+            ),
+        }
+    )
+    builder = ConfigBuilder(config=config, base_dir=temp_dir)
+    calls = []
+    serialize = builder.serialize
+
+    def record(config, *args):
+        calls.append(config)
+        return serialize(config, *args)
+
+    monkeypatch.setattr(builder, "serialize", record)
+
+    builder.build_all()
+
+    assert len(calls) == 2
+    assert builder.built_configs[temp_dir / "output2.yaml"] is calls[0]
+    contents = {(temp_dir / f"output{i}.yaml").read_bytes() for i in range(3)}
+    assert contents == {(temp_dir / "chained.yaml").read_bytes()}
+
+
+def test_parallel_build_identical(temp_dir):
+    """Test that parallel builds write the same outputs as sequential builds."""
+    builds = {
+        "default": BuildConfig(
+            input=[str(temp_dir / "base.yaml")], output=[str(temp_dir / "default.yaml")]
+        )
+    }
+    for i in range(8):
+        builds[f"env{i}"] = BuildConfig(
+            input=[str(temp_dir / "default.yaml"), str(temp_dir / "overlay.yaml")],
+            output=[str(temp_dir / "jobs" / f"env{i}.yaml")],
+        )
+    config = ConfigModel(builds=builds)
+
+    ConfigBuilder(config=config, base_dir=temp_dir).build_all()
+    sequential = {p.name: p.read_bytes() for p in (temp_dir / "jobs").iterdir()}
+    for p in (temp_dir / "jobs").iterdir():
+        p.unlink()
+
+    builder = ConfigBuilder(config=config, base_dir=temp_dir, options=BuildOptions(jobs=4))
+    builder.build_all()
+    parallel = {p.name: p.read_bytes() for p in (temp_dir / "jobs").iterdir()}
+
+    assert parallel == sequential
+    assert builder.written_outputs == [temp_dir / "jobs" / f"env{i}.yaml" for i in range(8)]
+    assert builder.source_cache.misses == 2
+
+
+def test_circular_dependency(temp_dir):
+    """Test that circular dependencies fail with the cycle instead of recursing."""
+    config = ConfigModel(
+        builds={
+            "a": BuildConfig(input=[str(temp_dir / "b.yaml")], output=[str(temp_dir / "a.yaml")]),
+            "b": BuildConfig(input=[str(temp_dir / "a.yaml")], output=[str(temp_dir / "b.yaml")]),
+        }
+    )
+
+    builder = ConfigBuilder(config=config, base_dir=temp_dir)
+    with pytest.raises(CircularDependencyError, match="a -> b -> a"):
+        builder.build_all()
+    with pytest.raises(CircularDependencyError):
+        builder.build_config(temp_dir / "a.yaml", [temp_dir / "b.yaml"])
+
+
+def test_stream_build_identical(temp_dir):
+    """Test that streamed outputs are identical to outputs serialized at once."""
+    (temp_dir / "many.yaml").write_text(
+        yaml.dump({f"key{i}": {"value": i, "items": list(range(i))} for i in range(20, 0, -1)})
+    )
+    config = ConfigModel(
+        builds={
+            "test": BuildConfig(
+                input=[str(temp_dir / "base.yaml"), str(temp_dir / "many.yaml")],
+                output=[str(temp_dir / "a" / "out1.yaml"), str(temp_dir / "a" / "out2.yaml")],
+            )
+        }
+    )
+    ConfigBuilder(config=config, base_dir=temp_dir).build_all()
+    expected = (temp_dir / "a" / "out1.yaml").read_bytes()
+    (temp_dir / "a" / "out2.yaml").unlink()
+
+    builder = ConfigBuilder(
+        config=config, base_dir=temp_dir, options=BuildOptions(stream=True, incremental=True)
+    )
+    builder.build_all()
+
+    assert builder.unchanged_outputs == [temp_dir / "a" / "out1.yaml"]
+    assert builder.written_outputs == [temp_dir / "a" / "out2.yaml"]
+    assert (temp_dir / "a" / "out2.yaml").read_bytes() == expected
+
+    builder = ConfigBuilder(
+        config=config, base_dir=temp_dir, options=BuildOptions(incremental=True)
+    )
+    builder.build_all()
+    assert len(builder.skipped_outputs) == 2
+
+
+def test_io_concurrency_identical(temp_dir):
+    """Test that prefetching and background writes produce the same outputs."""
+    config = ConfigModel(
+        builds={
+            "default": BuildConfig(
+                input=[str(temp_dir / "base.yaml")], output=[str(temp_dir / "default.yaml")]
+            ),
+            "prod": BuildConfig(
+                input=[str(temp_dir / "default.yaml"), str(temp_dir / "overlay.yaml")],
+                output=[str(temp_dir / "prod1.yaml"), str(temp_dir / "prod2.yaml")],
+            ),
+        }
+    )
+    ConfigBuilder(config=config, base_dir=temp_dir).build_all()
+    expected = {p.name: p.read_bytes() for p in temp_dir.iterdir()}
+    for path in temp_dir.iterdir():
+        if path.name not in ("base.yaml", "overlay.yaml"):
+            path.unlink()
+
+    builder = ConfigBuilder(
+        config=config, base_dir=temp_dir, options=BuildOptions(io_concurrency=4, jobs=2)
+    )
+    builder.build_all()
+
+    assert {p.name: p.read_bytes() for p in temp_dir.iterdir()} == expected
+    assert builder.source_cache.misses == 2
+    assert builder.written_outputs == [
+        temp_dir / n for n in ("default.yaml", "prod1.yaml", "prod2.yaml")
+    ]
+
+
+def test_io_concurrency_skips_up_to_date(temp_dir):
+    """Test that sources of up-to-date groups are not read ahead."""
+    config = ConfigModel(
+        builds={
+            "base": BuildConfig(
+                input=[str(temp_dir / "base.yaml")], output=[str(temp_dir / "base_out.yaml")]
+            ),
+            "overlay": BuildConfig(
+                input=[str(temp_dir / "overlay.yaml")], output=[str(temp_dir / "overlay_out.yaml")]
+            ),
+        }
+    )
+    ConfigBuilder(
+        config=config, base_dir=temp_dir, options=BuildOptions(incremental=True)
+    ).build_all()
+    (temp_dir / "overlay.yaml").write_text(yaml.dump({"logging": {"level": "debug"}}))
+
+    builder = ConfigBuilder(
+        config=config, base_dir=temp_dir, options=BuildOptions(incremental=True, io_concurrency=4)
+    )
+    builder.build_all()
+
+    assert builder.skipped_outputs == [temp_dir / "base_out.yaml"]
+    assert builder.rebuilt_outputs == [temp_dir / "overlay_out.yaml"]
+    assert builder.source_cache.misses == 1
+
+
+def test_build_in_memory(temp_dir):
+    """Test building groups in memory without writing outputs."""
+    config = ConfigModel(
+        builds={
+            "default": BuildConfig(
+                input=[str(temp_dir / "base.yaml")],
+                output=[str(temp_dir / "default.yaml")],
+            ),
+            "prod": BuildConfig(
+                input=[str(temp_dir / "default.yaml"), str(temp_dir / "overlay.yaml")],
+                output=[str(temp_dir / "prod1.yaml"), str(temp_dir / "prod2.yaml")],
+            ),
+        }
+    )
+    builder = ConfigBuilder(config=config, base_dir=temp_dir)
+
+    prod = builder.build_group("prod")
+    assert prod["database"]["port"] == 5433
+    assert builder.build_group("prod") is prod
+    outputs = dict(builder.iter_outputs(["prod"]))
+    assert list(outputs) == [temp_dir / "prod1.yaml", temp_dir / "prod2.yaml"]
+    assert all(value is prod for value in outputs.values())
+    serialized = dict(builder.iter_serialized())
+    assert sorted(p.name for p in temp_dir.iterdir()) == ["base.yaml", "overlay.yaml"]
+    assert builder.source_cache.misses == 2
+
+    builder.build_all()
+    assert {path: path.read_bytes() for path in serialized} == serialized
+    with pytest.raises(KeyError):
+        builder.build_group("missing")
+    with pytest.raises(KeyError):
+        list(builder.iter_outputs(["missing"]))
+
+
+def test_shared_prefix_merged_once(temp_dir):
+    """Test that groups with the same leading sources reuse their merged prefix."""
+    (temp_dir / "eu.yaml").write_text("logging: {level: warning}\n")
+    (temp_dir / "us.yaml").write_text("logging: {level: debug}\n")
+    shared = ["base.yaml", "overlay.yaml"]
+    config = ConfigModel(
+        builds={
+            "eu": BuildConfig(input=shared + ["eu.yaml"], output=["eu-out.yaml"]),
+            "us": BuildConfig(input=shared + ["us.yaml"], output=["us-out.yaml"]),
+        }
+    )
+    builder = ConfigBuilder(config=config, base_dir=temp_dir)
+    builder.build_all()
+
+    assert (builder.merge_memo.hits, builder.merge_memo.reused) == (1, 2)
+    eu = yaml.safe_load((temp_dir / "eu-out.yaml").read_text())
+    us = yaml.safe_load((temp_dir / "us-out.yaml").read_text())
+    assert eu["logging"] == {"level": "warning", "format": "json"}
+    assert us["logging"] == {"level": "debug", "format": "json"}
+    assert eu["database"] == us["database"]
+
+    # Rebuilding after changes does not keep merges of earlier sources
+    for i in range(5):
+        (temp_dir / "base.yaml").write_text(f"revision: {i}\n")
+        builder.invalidate_groups(["eu", "us"])
+        assert builder.build_group("eu")["revision"] == i
+        builder.build_group("us")
+        assert len(builder.merge_memo) == 1
+
+
+def test_memory_budget_releases_built_configs(temp_dir):
+    """Test that outputs are released once every group reading them is built."""
+    config = ConfigModel(
+        builds={
+            "default": BuildConfig(input=["base.yaml"], output=["default.yaml"]),
+            "prod": BuildConfig(input=["default.yaml", "overlay.yaml"], output=["prod.yaml"]),
+            "staging": BuildConfig(input=["default.yaml"], output=["staging.yaml"]),
+        }
+    )
+    expected = ConfigBuilder(config=config, base_dir=temp_dir)
+    expected.build_all()
+    outputs = {p: p.read_bytes() for p in expected.plan.output_paths}
+    for path in outputs:
+        path.unlink()
+
+    builder = ConfigBuilder(
+        config=config, base_dir=temp_dir, options=BuildOptions(memory_budget=1 << 20)
+    )
+    builder.build_all()
+
+    assert builder.built_configs == {}
+    assert {p: p.read_bytes() for p in outputs} == outputs
+    assert len(expected.built_configs) == 3
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_check_reports_stale_outputs(temp_dir, stream):
+    """Test that check lists missing and changed outputs without writing."""
+    config = ConfigModel(
+        builds={
+            "default": BuildConfig(input=["base.yaml"], output=["default.yaml"]),
+            "prod": BuildConfig(input=["default.yaml", "overlay.yaml"], output=["prod.yaml"]),
+        }
+    )
+    builder = ConfigBuilder(config=config, base_dir=temp_dir, options=BuildOptions(stream=stream))
+    assert builder.check() == [temp_dir / "default.yaml", temp_dir / "prod.yaml"]
+    assert not (temp_dir / "default.yaml").exists()
+
+    builder.build_all()
+    assert (
+        ConfigBuilder(config=config, base_dir=temp_dir, options=BuildOptions(stream=stream)).check()
+        == []
+    )
+
+    (temp_dir / "prod.yaml").write_text("stale: true\n")
+    builder = ConfigBuilder(config=config, base_dir=temp_dir, options=BuildOptions(stream=stream))
+    assert builder.check() == [temp_dir / "prod.yaml"]
+    assert (temp_dir / "prod.yaml").read_text() == "stale: true\n"
+
+
+def test_memory_budget_with_io_concurrency(temp_dir, monkeypatch):
+    """Test that prefetched sources are only held by the size-limited cache."""
+    config = ConfigModel(
+        builds={
+            f"group{i}": BuildConfig(input=[f"src/{i}.yaml"], output=[f"out/{i}.yaml"])
+            for i in range(50)
+        }
+    )
+    (temp_dir / "src").mkdir()
+    for i in range(50):
+        (temp_dir / "src" / f"{i}.yaml").write_text(
+            yaml.dump({f"key{i}_{j}": "x" * 100 for j in range(20)})
+        )
+    prefetches = []
+
+    class RecordingPipeline(IOPipeline):
+        def close(self):
+            prefetches.extend(self._prefetches)
+            super().close()
+
+    monkeypatch.setattr("pydantic_config_builder.builder.IOPipeline", RecordingPipeline)
+    builder = ConfigBuilder(
+        config=config,
+        base_dir=temp_dir,
+        options=BuildOptions(memory_budget=20_000, io_concurrency=4),
+    )
+    builder.build_all()
+
+    assert len(prefetches) == 50
+    assert all(f.cancelled() or f.result() is None for f in prefetches)
+    assert builder.source_cache.nbytes <= 20_000
+    assert builder.source_cache.evictions > 0
+    assert yaml.safe_load((temp_dir / "out" / "49.yaml").read_text())["key49_0"] == "x" * 100
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_check_serializes_group_once(temp_dir, monkeypatch, stream):
+    """Test that check serializes a group with several outputs once."""
+    config = ConfigModel(
+        builds={
+            "test": BuildConfig(
+                input=["base.yaml", "overlay.yaml"],
+                output=[f"output{i}.yaml" for i in range(3)],
+            )
+        }
+    )
+    method = "serialize_chunks" if stream else "serialize"
+
+    def record_calls(builder):
+        calls = []
+        serialize = getattr(builder, method)
+
+        def record(config, *args):
+            calls.append(config)
+            return serialize(config, *args)
+
+        monkeypatch.setattr(builder, method, record)
+        return calls
+
+    for stale in ([], ["output0.yaml"], ["output1.yaml", "output2.yaml"]):
+        ConfigBuilder(config=config, base_dir=temp_dir).build_all()
+        for name in stale:
+            (temp_dir / name).write_text("stale: true\n")
+        builder = ConfigBuilder(
+            config=config, base_dir=temp_dir, options=BuildOptions(stream=stream)
+        )
+        calls = record_calls(builder)
+
+        assert builder.check() == [temp_dir / name for name in stale]
+        assert len(calls) == 1
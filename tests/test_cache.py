@@ -0,0 +1,71 @@
+"""Tests for SourceCache."""
+import os
+
+import yaml
+
+from pydantic_config_builder.builder import load_yaml, merge_dicts
+from pydantic_config_builder.cache import SourceCache
+from pydantic_config_builder.memory import estimate_size
+
+
+def test_cache_hit(tmp_path):
+    """Test that a file is parsed once."""
+    path = tmp_path / "base.yaml"
+    path.write_text(yaml.dump({"a": {"b": 1}}))
+
+    cache = SourceCache(load_yaml)
+    first = cache.load(path)
+    second = cache.load(path)
+
+    assert first is second
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_cache_reload_on_change(tmp_path):
+    """Test that a changed file is parsed again."""
+    path = tmp_path / "base.yaml"
+    path.write_text(yaml.dump({"a": 1}))
+
+    cache = SourceCache(load_yaml)
+    assert cache.load(path) == {"a": 1}
+
+    path.write_text(yaml.dump({"a": 22}))
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert cache.load(path) == {"a": 22}
+    assert cache.misses == 2
+
+
+def test_cache_entry_not_modified_by_merge(tmp_path):
+    """Test that merging a cached config does not modify the cached entry."""
+    path = tmp_path / "base.yaml"
+    path.write_text(yaml.dump({"a": {"b": 1, "c": {"d": 2}}}))
+
+    cache = SourceCache(load_yaml)
+    result = merge_dicts({}, cache.load(path))
+    result = merge_dicts(result, {"a": {"b": 3, "c": {"e": 4}}})
+
+    assert result == {"a": {"b": 3, "c": {"d": 2, "e": 4}}}
+    assert cache.load(path) == {"a": {"b": 1, "c": {"d": 2}}}
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Test that a size limit evicts the least recently used files."""
+    paths = []
+    for name in "abc":
+        paths.append(tmp_path / f"{name}.yaml")
+        paths[-1].write_text(yaml.dump({name: list(range(100))}))
+    size = estimate_size(load_yaml(paths[0]))
+
+    cache = SourceCache(load_yaml, max_bytes=2 * size)
+    a = cache.load(paths[0])
+    cache.load(paths[1])
+    assert cache.load(paths[0]) is a
+    cache.load(paths[2])
+
+    assert (len(cache), cache.evictions, cache.nbytes) == (2, 1, 2 * size)
+    assert cache.load(paths[0]) is a
+    cache.load(paths[1])
+    assert cache.misses == 4
@@ -1,4 +1,8 @@
 """Tests for CLI."""
+import json
+import sys
+import threading
+import time
 from pathlib import Path
 
 import pytest
@@ -6,6 +10,7 @@ import yaml
 from click.testing import CliRunner
 
 from pydantic_config_builder.cli import main
+from pydantic_config_builder.client import BuildClient
 
 
 @pytest.fixture
@@ -169,3 +174,214 @@ def test_cli_nonexistent_group(temp_dir):
     result = runner.invoke(main, ["-c", str(config), "-g", "nonexistent"])
     assert result.exit_code != 0
     assert "None of the specified groups" in result.output
+
+
+def test_cli_group_dependencies(temp_dir):
+    """Test CLI building a group together with the groups it depends on."""
+    config = temp_dir / "pydantic_config_builder.yml"
+    config.write_text(
+        yaml.dump(
+            {
+                "default": {"input": ["base.yaml"], "output": ["default.yaml"]},
+                "production": {"input": ["default.yaml"], "output": ["prod.yaml"]},
+                "other": {"input": ["base.yaml"], "output": ["other.yaml"]},
+            }
+        )
+    )
+
+    runner = CliRunner()
+    result = runner.invoke(main, ["-c", str(config), "-g", "production", "--no-write-dependencies"])
+    assert result.exit_code == 0
+    assert yaml.safe_load((temp_dir / "prod.yaml").read_text())["database"]["port"] == 5432
+    assert not (temp_dir / "default.yaml").exists()
+    assert not (temp_dir / "other.yaml").exists()
+
+    result = runner.invoke(main, ["-c", str(config), "-g", "production"])
+    assert result.exit_code == 0
+    assert (temp_dir / "default.yaml").exists()
+    assert not (temp_dir / "other.yaml").exists()
+
+
+def test_cli_sort_keys(temp_dir):
+    """Test CLI sorting keys at every level or keeping merged order."""
+    (temp_dir / "flags.yaml").write_text("f10: {b: 1, a: 2}\nf9: 1\n")
+    config = temp_dir / "pydantic_config_builder.yml"
+    config.write_text(yaml.dump({"flags": {"input": ["flags.yaml"], "output": ["out.yaml"]}}))
+
+    runner = CliRunner()
+    result = runner.invoke(main, ["-c", str(config), "--sort-keys", "recursive"])
+    assert result.exit_code == 0
+    assert (temp_dir / "out.yaml").read_text() == "f9: 1\nf10:\n  a: 2\n  b: 1\n"
+
+    result = runner.invoke(main, ["-c", str(config), "--sort-keys", "none"])
+    assert result.exit_code == 0
+    assert (temp_dir / "out.yaml").read_text() == "f10:\n  b: 1\n  a: 2\nf9: 1\n"
+
+
+def test_cli_incremental(temp_dir):
+    """Test CLI incremental build and force option."""
+    config = str(temp_dir / "pydantic_config_builder.yml")
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["-c", config, "--incremental"])
+    assert result.exit_code == 0
+    assert "Rebuilt 1 outputs, skipped 0 up-to-date outputs" in result.output
+
+    result = runner.invoke(main, ["-c", config, "--incremental"])
+    assert result.exit_code == 0
+    assert "Rebuilt 0 outputs, skipped 1 up-to-date outputs" in result.output
+
+    result = runner.invoke(main, ["-c", config, "--incremental", "--force"])
+    assert result.exit_code == 0
+    assert "Rebuilt 1 outputs, skipped 0 up-to-date outputs" in result.output
+
+
+def test_cli_config_snapshot(temp_dir):
+    """Test that incremental builds reuse the validated configuration until it changes."""
+    config = temp_dir / "pydantic_config_builder.yml"
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["-c", str(config), "--incremental", "-v"])
+    assert result.exit_code == 0
+    assert "Using configuration snapshot" not in result.output
+
+    result = runner.invoke(main, ["-c", str(config), "--incremental", "-v"])
+    assert result.exit_code == 0
+    assert "Using configuration snapshot" in result.output
+
+    config.write_text(
+        yaml.dump({"test": {"input": ["base.yaml"], "output": ["output.yaml", "copy.yaml"]}})
+    )
+    result = runner.invoke(main, ["-c", str(config), "--incremental", "-v"])
+    assert result.exit_code == 0
+    assert "Using configuration snapshot" not in result.output
+    assert (temp_dir / "copy.yaml").exists()
+
+    # Configurations in one directory each keep their own snapshot
+    other = temp_dir / "other.yml"
+    other.write_text(yaml.dump({"other": {"input": ["base.yaml"], "output": ["other.yaml"]}}))
+    for expected in [1, 2]:
+        result = runner.invoke(main, ["-c", str(config), "-c", str(other), "--incremental", "-v"])
+        assert result.exit_code == 0
+        assert result.output.count("Using configuration snapshot") == expected
+
+
+def test_cli_multiple_configs(temp_dir):
+    """Test CLI building several configuration files in one process."""
+    for name in ["api", "web"]:
+        (temp_dir / name).mkdir()
+        (temp_dir / name / "pydantic-config-builder.yml").write_text(
+            yaml.dump({name: {"input": ["../base.yaml"], "output": ["out.yaml"]}})
+        )
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["--discover", str(temp_dir), "--config-jobs", "2", "-g", "web"])
+    assert result.exit_code == 0
+    assert not (temp_dir / "api" / "out.yaml").exists()
+    assert (temp_dir / "web" / "out.yaml").exists()
+
+    config = str(temp_dir / "pydantic_config_builder.yml")
+    for rebuilt, skipped in [(3, 0), (0, 3)]:
+        result = runner.invoke(main, ["-c", config, "--discover", str(temp_dir), "--incremental"])
+        assert result.exit_code == 0
+        assert f"Rebuilt {rebuilt} outputs, skipped {skipped} up-to-date outputs" in result.output
+    assert (temp_dir / "output.yaml").exists()
+
+    result = runner.invoke(main, ["--discover", str(temp_dir), "--graph", "json"])
+    assert result.exit_code != 0
+    assert "need a single configuration file" in result.output
+
+
+def test_cli_check(temp_dir):
+    """Test that --check fails listing stale outputs and writes nothing."""
+    config = str(temp_dir / "pydantic_config_builder.yml")
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["-c", config, "--check", "--incremental"])
+    assert result.exit_code == 1
+    assert "1 outputs are not up to date" in result.output
+    assert str(temp_dir / "output.yaml") in result.output
+    assert not (temp_dir / "output.yaml").exists()
+    assert not (temp_dir / ".pydantic-config-builder-cache").exists()
+
+    assert runner.invoke(main, ["-c", config]).exit_code == 0
+    result = runner.invoke(main, ["-c", config, "--check", "--incremental"])
+    assert result.exit_code == 0
+    assert "All outputs are up to date" in result.output
+
+    (temp_dir / "output.yaml").unlink()
+    for option in (["--watch"], ["--serve", "s.sock"], ["--connect", "s.sock"], ["--graph", "dot"]):
+        result = runner.invoke(main, ["-c", config, "--check", *option])
+        assert result.exit_code != 0
+        assert "--check cannot be used with" in result.output
+    assert not (temp_dir / "output.yaml").exists()
+
+
+def test_cli_graph(temp_dir):
+    """Test printing the dependency graph without building."""
+    runner = CliRunner()
+    result = runner.invoke(
+        main, ["-c", str(temp_dir / "pydantic_config_builder.yml"), "--graph", "json"]
+    )
+    assert result.exit_code == 0
+    assert [g["name"] for g in json.loads(result.output)["groups"]] == ["test"]
+    assert not (temp_dir / "output.yaml").exists()
+
+
+def test_cli_profile(temp_dir):
+    """Test printing a profile and writing a JSON trace or cProfile dump."""
+    config = str(temp_dir / "pydantic_config_builder.yml")
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["-c", config, "--profile"])
+    assert result.exit_code == 0
+    assert "Profile:" in result.output
+    assert "Slowest groups:" in result.output
+
+    trace = temp_dir / "trace.json"
+    result = runner.invoke(main, ["-c", config, "--profile-output", str(trace)])
+    assert result.exit_code == 0
+    data = json.loads(trace.read_text())
+    assert {e["cat"] for e in data["traceEvents"]} == {
+        "config_load",
+        "validate",
+        "resolve",
+        "parse",
+        "merge",
+        "sort",
+        "dump",
+        "write",
+    }
+
+    stats = temp_dir / "build.prof"
+    result = runner.invoke(main, ["-c", config, "--profile-output", str(stats)])
+    assert result.exit_code == 0
+    assert stats.stat().st_size > 0
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs Unix sockets")
+def test_cli_serve_and_connect(temp_dir):
+    """Test building through a server started with --serve."""
+    config = str(temp_dir / "pydantic_config_builder.yml")
+    sock = temp_dir / "server.sock"
+    runner = CliRunner()
+    thread = threading.Thread(
+        target=runner.invoke, args=(main, ["-c", config, "--serve", str(sock)])
+    )
+    thread.start()
+    try:
+        deadline = time.monotonic() + 5
+        while not sock.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        result = runner.invoke(main, ["--connect", str(sock), "-v"])
+        assert result.exit_code == 0
+        assert "Wrote 1 outputs, 0 unchanged" in result.output
+        assert (temp_dir / "output.yaml").exists()
+
+        result = runner.invoke(main, ["--connect", str(sock), "-g", "missing"])
+        assert result.exit_code != 0
+        assert "Unknown groups: missing" in result.output
+    finally:
+        BuildClient(sock, timeout=5).shutdown()
+        thread.join(5)
@@ -0,0 +1,109 @@
+"""Tests for GlobIndex."""
+import glob
+import os
+
+import pytest
+
+from pydantic_config_builder.config import BuildConfig, ConfigModel
+from pydantic_config_builder.globindex import GlobIndex
+from pydantic_config_builder.plan import BuildPlan
+
+PATTERNS = [
+    "*.yaml",
+    "**",
+    "**/*.yaml",
+    "**/*",
+    "**/",
+    "*/",
+    "configs/**/*.yaml",
+    "configs/**",
+    "configs/**/",
+    "configs/*/base.yaml",
+    "configs/*/missing.yaml",
+    "configs/?ev/*.yaml",
+    "configs/[dp]*/*.y*ml",
+    "configs/[!d]*/*.yaml",
+    "configs/**/**/*.yaml",
+    "configs/.hidden/*.yaml",
+    "configs/.*/*.yaml",
+    "configs/*/.*",
+    "**/.*",
+    "link/*.yaml",
+    "*/**/*.yaml",
+    "missing/**/*.yaml",
+    "configs/dev/base.yaml",
+    "configs/dev/",
+    "configs/dev/base.yaml/*",
+]
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Create a directory tree with hidden entries, nesting and a symlink."""
+    for rel in [
+        "top.yaml",
+        "configs/dev/base.yaml",
+        "configs/dev/extra.yml",
+        "configs/dev/nested/deep/x.yaml",
+        "configs/dev/.secret.yaml",
+        "configs/prod/base.yaml",
+        "configs/prod/notes.txt",
+        "configs/.hidden/h.yaml",
+        "configs/rev/r.yaml",
+    ]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("a: 1\n")
+    (tmp_path / "configs" / "empty").mkdir()
+    os.symlink(tmp_path / "configs" / "dev", tmp_path / "link")
+    os.symlink(tmp_path / "nowhere", tmp_path / "configs" / "broken.yaml")
+    return tmp_path
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_matches_glob(tree, pattern):
+    """Test that absolute patterns match exactly what glob.glob matches."""
+    abs_pattern = str(tree / pattern)
+    assert GlobIndex().glob(abs_pattern) == glob.glob(abs_pattern, recursive=True)
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_matches_glob_relative(tree, pattern, monkeypatch):
+    """Test that relative patterns match exactly what glob.glob matches."""
+    monkeypatch.chdir(tree)
+    assert GlobIndex().glob(pattern) == glob.glob(pattern, recursive=True)
+
+
+def test_directories_listed_once(tree, monkeypatch):
+    """Test that many patterns over the same tree scan each directory once."""
+    scanned = []
+    real_scandir = os.scandir
+
+    def scandir(path):
+        scanned.append(path)
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", scandir)
+    index = GlobIndex()
+    for pattern in PATTERNS:
+        index.glob(str(tree / pattern))
+
+    assert len(scanned) == len(set(scanned))
+    assert index.scans == len(scanned)
+
+
+def test_plan_shares_index(tree):
+    """Test that a plan resolves the same sources as separate glob calls."""
+    config = ConfigModel(
+        builds={
+            f"group{i}": BuildConfig(input=["configs/**/*.yaml", "top.yaml"], output=[f"o{i}.yaml"])
+            for i in range(3)
+        }
+    )
+    index = GlobIndex()
+    plan = BuildPlan.from_config(config, tree, index)
+
+    expected = config.resolve_sources(config.builds["group0"], tree)
+    assert all(group.sources == expected for group in plan.groups.values())
+    # Every visible directory below configs is listed once, and nothing else
+    assert index.scans == len(glob.glob(str(tree / "configs/**") + os.sep, recursive=True))
@@ -0,0 +1,46 @@
+"""Tests for dependency graph export."""
+import json
+from pathlib import Path
+
+from pydantic_config_builder.config import BuildConfig, ConfigModel
+from pydantic_config_builder.graph import graph_data, to_dot, to_json
+from pydantic_config_builder.plan import BuildPlan
+
+
+def make_plan():
+    """Create a plan with a chain and a fan-in."""
+    config = ConfigModel(
+        builds={
+            "development": BuildConfig(input=["base.yaml"], output=["default.yaml"]),
+            "region": BuildConfig(input=["region.yaml"], output=["region-out.yaml"]),
+            "staging": BuildConfig(input=["default.yaml"], output=["staging.yaml"]),
+            "production": BuildConfig(
+                input=["staging.yaml", "region-out.yaml"], output=["prod.yaml"]
+            ),
+        }
+    )
+    return BuildPlan.from_config(config, Path("/base/dir"))
+
+
+def test_graph_data():
+    """Test depth, fan-in and longest chain."""
+    data = graph_data(make_plan())
+    groups = {g["name"]: g for g in data["groups"]}
+
+    assert groups["development"]["depth"] == 0
+    assert groups["production"]["depth"] == 2
+    assert groups["production"]["fan_in"] == 2
+    assert groups["development"]["fan_out"] == 1
+    assert data["max_depth"] == 2
+    assert data["longest_chain"] == ["development", "staging", "production"]
+    assert json.loads(to_json(make_plan())) == data
+
+
+def test_to_dot():
+    """Test DOT output contains groups, outputs and edges."""
+    dot = to_dot(make_plan())
+
+    assert dot.startswith("digraph builds {")
+    assert '"group:production" [shape=box, label="production\\ndepth=2 fan_in=2"];' in dot
+    assert '"group:development" -> "/base/dir/default.yaml";' in dot
+    assert '"/base/dir/default.yaml" -> "group:staging";' in dot
@@ -0,0 +1,132 @@
+"""Tests for incremental builds."""
+import yaml
+
+from pydantic_config_builder.builder import ConfigBuilder
+from pydantic_config_builder.config import BuildConfig, ConfigModel
+from pydantic_config_builder.incremental import (
+    CACHE_DIR_NAME,
+    BuildManifest,
+    Builds,
+    hash_file,
+    load_config_snapshot,
+    save_config_snapshot,
+)
+from pydantic_config_builder.options import BuildOptions
+
+
+def make_builder(tmp_path, **kwargs):
+    """Create an incremental builder with a chained configuration."""
+    config = ConfigModel(
+        builds={
+            "development": BuildConfig(input=["base.yaml"], output=["default.yaml"]),
+            "production": BuildConfig(
+                input=["default.yaml", "prod.yaml"], output=["prod-out.yaml"]
+            ),
+        }
+    )
+    return ConfigBuilder(
+        config=config, base_dir=tmp_path, options=BuildOptions(incremental=True, **kwargs)
+    )
+
+
+def test_skip_unchanged(tmp_path):
+    """Test that unchanged outputs are skipped on the next build."""
+    (tmp_path / "base.yaml").write_text(yaml.dump({"a": 1}))
+    (tmp_path / "prod.yaml").write_text(yaml.dump({"b": 2}))
+
+    builder = make_builder(tmp_path)
+    builder.build_all()
+    assert len(builder.rebuilt_outputs) == 2
+    assert (tmp_path / CACHE_DIR_NAME).is_dir()
+
+    builder = make_builder(tmp_path)
+    builder.build_all()
+    assert builder.rebuilt_outputs == []
+    assert len(builder.skipped_outputs) == 2
+
+
+def test_rebuild_dependents(tmp_path):
+    """Test that a changed source rebuilds its group and dependent groups."""
+    (tmp_path / "base.yaml").write_text(yaml.dump({"a": 1}))
+    (tmp_path / "prod.yaml").write_text(yaml.dump({"b": 2}))
+    make_builder(tmp_path).build_all()
+
+    (tmp_path / "base.yaml").write_text(yaml.dump({"a": 10}))
+    builder = make_builder(tmp_path)
+    builder.build_all()
+
+    assert builder.rebuilt_outputs == [tmp_path / "default.yaml", tmp_path / "prod-out.yaml"]
+    assert yaml.safe_load((tmp_path / "prod-out.yaml").read_text()) == {"a": 10, "b": 2}
+
+
+def test_rebuild_modified_output(tmp_path):
+    """Test that an output edited or deleted by hand is rebuilt."""
+    (tmp_path / "base.yaml").write_text(yaml.dump({"a": 1}))
+    (tmp_path / "prod.yaml").write_text(yaml.dump({"b": 2}))
+    make_builder(tmp_path).build_all()
+
+    (tmp_path / "prod-out.yaml").write_text("edited: true\n")
+    (tmp_path / "default.yaml").unlink()
+    builder = make_builder(tmp_path)
+    builder.build_all()
+
+    assert builder.rebuilt_outputs == [tmp_path / "default.yaml", tmp_path / "prod-out.yaml"]
+
+
+def test_force(tmp_path):
+    """Test that force rebuilds up-to-date outputs."""
+    (tmp_path / "base.yaml").write_text(yaml.dump({"a": 1}))
+    (tmp_path / "prod.yaml").write_text(yaml.dump({"b": 2}))
+    make_builder(tmp_path).build_all()
+
+    builder = make_builder(tmp_path, force=True)
+    builder.build_all()
+
+    assert len(builder.rebuilt_outputs) == 2
+    assert builder.skipped_outputs == []
+
+
+def test_manifest_file_hash(tmp_path):
+    """Test that file hashes are recorded and survive a reload."""
+    path = tmp_path / "base.yaml"
+    path.write_text("a: 1\n")
+    manifest = BuildManifest(tmp_path / "manifest.json")
+
+    assert manifest.file_hash(path) == hash_file(path)
+    manifest.save()
+
+    assert BuildManifest.load(tmp_path / "manifest.json").files == manifest.files
+
+
+def test_manifest_save_merges(tmp_path):
+    """Test that saving keeps entries another builder saved since loading."""
+    for name in ["a.yaml", "b.yaml"]:
+        (tmp_path / name).write_text("a: 1\n")
+    first = BuildManifest.load(tmp_path / "manifest.json")
+    second = BuildManifest.load(tmp_path / "manifest.json")
+    first.record(tmp_path / "a.yaml", "digest-a", "hash-a")
+    first.save()
+    second.record(tmp_path / "b.yaml", "digest-b", "hash-b")
+    second.save()
+
+    saved = BuildManifest.load(tmp_path / "manifest.json")
+    assert set(saved.outputs) == {str(tmp_path / "a.yaml"), str(tmp_path / "b.yaml")}
+    assert [p.name for p in tmp_path.iterdir() if p.suffix == ".tmp"] == []
+
+
+def test_config_snapshot(tmp_path):
+    """Test that a configuration snapshot is only loaded for the same content hash."""
+    path = tmp_path / "config.json"
+    builds: Builds = {
+        "b": {"input": ["x.yaml"], "output": ["b.yaml"]},
+        "a": {"input": [], "output": []},
+    }
+    save_config_snapshot(path, "hash", builds)
+
+    assert load_config_snapshot(path, "hash") == builds
+    assert list(load_config_snapshot(path, "hash") or {}) == ["b", "a"]
+    assert load_config_snapshot(path, "other") is None
+    assert load_config_snapshot(tmp_path / "missing.json", "hash") is None
+
+    path.write_text('{"version": "0", "config_hash": "hash", "builds": {"b": {"input": 1}}}')
+    assert load_config_snapshot(path, "hash") is None
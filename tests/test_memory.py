@@ -0,0 +1,37 @@
+"""Tests for memory accounting."""
+import sys
+
+import pytest
+
+from pydantic_config_builder.memory import estimate_size, format_size, parse_size, peak_rss
+
+
+def test_parse_size():
+    """Test sizes with and without units."""
+    assert parse_size("1048576") == 1 << 20
+    assert parse_size("512M") == 512 << 20
+    assert parse_size("1.5GiB") == 3 << 29
+    assert parse_size(" 64 kb ") == 64 << 10
+    with pytest.raises(ValueError, match="Invalid size"):
+        parse_size("lots")
+
+
+def test_format_size():
+    """Test human-readable byte counts."""
+    assert format_size(512) == "512 B"
+    assert format_size(3 << 19) == "1.5 MiB"
+    assert format_size(5 << 30) == "5.0 GiB"
+
+
+def test_estimate_size_counts_shared_objects_once():
+    """Test that a value referenced twice is counted once."""
+    shared = list(range(1000))
+    single = estimate_size({"a": shared})
+    assert single > sys.getsizeof(shared)
+    assert estimate_size({"a": shared, "b": shared}) < single + sys.getsizeof(shared) // 2
+
+
+def test_peak_rss():
+    """Test that peak memory is reported where the platform supports it."""
+    rss = peak_rss()
+    assert rss is None or rss > 1 << 20
@@ -0,0 +1,81 @@
+"""Tests for merge_all and the merge memo."""
+import copy
+import random
+from typing import Any, Dict
+
+from pydantic_config_builder.builder import merge_dicts
+from pydantic_config_builder.merge import MergeMemo, branch_points, merge_all
+
+
+def random_config(rng, depth=0):
+    """Generate a random nested config over a small key space so keys collide."""
+    config = {}
+    for _ in range(rng.randint(0, 4)):
+        key = rng.choice("abcde")
+        if depth < 3 and rng.random() < 0.5:
+            config[key] = random_config(rng, depth + 1)
+        else:
+            config[key] = rng.choice([1, "x", None, [1, 2], {}])
+    return config
+
+
+def test_merge_all_matches_merge_dicts():
+    """Test that merge_all equals folding merge_dicts, including key order."""
+    rng = random.Random(0)
+    for _ in range(500):
+        configs = [random_config(rng) for _ in range(rng.randint(0, 6))]
+        originals = copy.deepcopy(configs)
+
+        expected: Dict[str, Any] = {}
+        for config in configs:
+            expected = merge_dicts(expected, config)
+        result = merge_all(configs)
+
+        assert result == expected
+        assert repr(result) == repr(expected)
+        assert configs == originals
+
+
+def test_merge_all_base_not_modified():
+    """Test merging onto a base without modifying it."""
+    base = {"a": {"b": 1}, "c": 2}
+
+    result = merge_all([{"a": {"d": 3}}, {"a": {"b": 4}}], base=base)
+
+    assert result == {"a": {"b": 4, "d": 3}, "c": 2}
+    assert base == {"a": {"b": 1}, "c": 2}
+
+
+def test_merge_all_shares_untouched_mappings():
+    """Test that mappings no later config overrides are not copied."""
+    untouched = {"x": 1}
+    overridden = {"y": 1}
+
+    result = merge_all([{"u": untouched, "o": overridden}, {"o": {"y": 2}}])
+
+    assert result["u"] is untouched
+    assert result["o"] is not overridden
+    assert overridden == {"y": 1}
+
+
+def test_branch_points():
+    """Test that prefixes are memoized where shared sources branch or end."""
+    sequences = [["a", "b", "c"], ["a", "b", "d"], ["a", "b"], ["a", "e"], ["f"]]
+    assert branch_points(sequences) == [[1, 2], [1, 2], [1, 2], [1], []]
+
+
+def test_merge_memo_reuses_prefixes():
+    """Test that memoized prefixes give the same results as merging from scratch."""
+    rng = random.Random(1)
+    base, region, overlay1, overlay2 = (random_config(rng) for _ in range(4))
+    memo = MergeMemo()
+
+    first, reused = memo.merge([base, region, overlay1], [2])
+    assert (first, reused) == (merge_all([base, region, overlay1]), 0)
+    second, reused = memo.merge([base, region, overlay2], [2])
+    assert (second, reused) == (merge_all([base, region, overlay2]), 2)
+    assert (memo.hits, memo.reused, len(memo)) == (1, 2, 1)
+
+    # A changed input is a different object, so its prefix is not reused
+    _, reused = memo.merge([copy.deepcopy(base), region, overlay2], [2])
+    assert reused == 0
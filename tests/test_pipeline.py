@@ -0,0 +1,56 @@
+"""Tests for IOPipeline."""
+import threading
+import time
+
+import pytest
+
+from pydantic_config_builder.pipeline import IOPipeline
+
+
+def test_prefetch_concurrent(tmp_path):
+    """Test that prefetched loads run concurrently up to the limit."""
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def load(path):
+        with lock:
+            running.append(path)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(path)
+        return path
+
+    with IOPipeline(4) as pipeline:
+        pipeline.prefetch([tmp_path / f"{i}.yaml" for i in range(12)], load)
+        pipeline.wait_prefetched()
+
+    assert max(peak) == 4
+
+
+def test_prefetch_errors_ignored(tmp_path):
+    """Test that failing loads do not raise from the pipeline."""
+
+    def load(path):
+        raise FileNotFoundError(path)
+
+    with IOPipeline(2) as pipeline:
+        pipeline.prefetch([tmp_path / "missing.yaml"], load)
+        pipeline.wait_prefetched()
+        pipeline.wait()
+
+
+def test_write_error_raised():
+    """Test that wait re-raises the first write error after all writes finished."""
+    done = []
+
+    def fail():
+        raise OSError("disk full")
+
+    with IOPipeline(2) as pipeline:
+        pipeline.submit_write(fail)
+        pipeline.submit_write(lambda: done.append(True))
+        with pytest.raises(OSError, match="disk full"):
+            pipeline.wait()
+    assert done == [True]
@@ -0,0 +1,112 @@
+"""Tests for BuildPlan."""
+from pathlib import Path
+
+import pytest
+
+from pydantic_config_builder.config import BuildConfig, ConfigModel
+from pydantic_config_builder.globindex import GlobIndex
+from pydantic_config_builder.plan import BuildPlan, CircularDependencyError
+
+
+def test_plan_outputs():
+    """Test output to source mapping of a plan."""
+    config = ConfigModel(
+        builds={
+            "test_group": BuildConfig(
+                input=["base.yaml", "overlay.yaml"],
+                output=["output1.yaml", "output2.yaml"],
+            )
+        }
+    )
+    base_dir = Path("/base/dir")
+
+    plan = BuildPlan.from_config(config, base_dir)
+
+    assert plan.output_sources == config.get_resolved_config(base_dir)
+    assert plan.output_paths == {base_dir / "output1.yaml", base_dir / "output2.yaml"}
+    assert plan.group_for_output(base_dir / "output2.yaml").name == "test_group"
+
+
+def test_plan_dependencies():
+    """Test dependency graph between groups."""
+    config = ConfigModel(
+        builds={
+            "development": BuildConfig(input=["base.yaml"], output=["default.yaml"]),
+            "production": BuildConfig(
+                input=["default.yaml", "prod.yaml"], output=["prod-out.yaml"]
+            ),
+            "staging": BuildConfig(input=["default.yaml"], output=["staging-out.yaml"]),
+        }
+    )
+
+    plan = BuildPlan.from_config(config, Path("/base/dir"))
+
+    assert plan.dependencies == {
+        "development": [],
+        "production": ["development"],
+        "staging": ["development"],
+    }
+    assert plan.dependents["development"] == ["production", "staging"]
+
+
+def test_plan_selected_groups(tmp_path):
+    """Test that a plan for some groups only resolves them and their dependencies."""
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    (tmp_path / "a" / "base.yaml").write_text("key: value\n")
+    config = ConfigModel(
+        builds={
+            "base": BuildConfig(input=["a/*.yaml"], output=["default.yaml"]),
+            "unrelated": BuildConfig(input=["b/*.yaml"], output=["other.yaml"]),
+            "production": BuildConfig(input=["default.yaml"], output=["prod.yaml"]),
+        }
+    )
+    index = GlobIndex()
+
+    plan = BuildPlan.from_config(config, tmp_path, index, groups=["production", "missing"])
+
+    assert list(plan.groups) == ["base", "production"]
+    assert plan.dependencies == {"base": [], "production": ["base"]}
+    assert index.scans == 1
+
+
+def test_plan_duplicate_output():
+    """Test that a later group takes over an output claimed by an earlier one."""
+    config = ConfigModel(
+        builds={
+            "first": BuildConfig(input=["a.yaml"], output=["out.yaml", "first.yaml"]),
+            "second": BuildConfig(input=["b.yaml"], output=["out.yaml"]),
+        }
+    )
+    base_dir = Path("/base/dir")
+
+    plan = BuildPlan.from_config(config, base_dir)
+
+    assert plan.groups["first"].outputs == [base_dir / "first.yaml"]
+    assert plan.output_sources[base_dir / "out.yaml"] == [base_dir / "b.yaml"]
+
+
+def test_plan_cycle():
+    """Test that a dependency cycle is reported with its groups."""
+    config = ConfigModel(
+        builds={
+            "base": BuildConfig(input=["base.yaml"], output=["default.yaml"]),
+            "a": BuildConfig(input=["default.yaml", "c.yaml"], output=["a.yaml"]),
+            "b": BuildConfig(input=["a.yaml"], output=["b.yaml"]),
+            "c": BuildConfig(input=["b.yaml"], output=["c.yaml"]),
+        }
+    )
+    plan = BuildPlan.from_config(config, Path("/base/dir"))
+
+    assert plan.find_cycle() == ["a", "c", "b", "a"]
+    with pytest.raises(CircularDependencyError, match="a -> c -> b -> a"):
+        assert plan.order
+
+
+def test_plan_self_dependency():
+    """Test that a group reading its own output is a cycle."""
+    config = ConfigModel(
+        builds={"a": BuildConfig(input=["a.yaml"], output=["a.yaml"])},
+    )
+
+    assert BuildPlan.from_config(config, Path("/base/dir")).find_cycle() == ["a", "a"]
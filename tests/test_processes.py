@@ -0,0 +1,54 @@
+"""Tests for worker processes."""
+import os
+
+import pytest
+import yaml
+
+from pydantic_config_builder.builder import ConfigBuilder
+from pydantic_config_builder.config import BuildConfig, ConfigModel
+from pydantic_config_builder.options import BuildOptions
+from pydantic_config_builder.processes import parse, process_pool, serialize
+from pydantic_config_builder.sorting import KeySorter
+from pydantic_config_builder.yaml_backend import YamlBackend
+
+
+def test_worker_functions_match_backend(tmp_path):
+    """Test that workers parse and serialize like the backend, keeping shared values."""
+    path = tmp_path / "source.yaml"
+    path.write_text("b10: {x: 1}\nb9: [1, 2]\n")
+    shared = {"y": 1, "x": 2}
+    config = {"b10": shared, "b9": shared}
+    expected = YamlBackend().dump(KeySorter("recursive").sort(config))
+
+    with process_pool(2) as pool:
+        assert pool.submit(parse, "auto", path).result() == YamlBackend().load(path)
+        data = pool.submit(serialize, "auto", "recursive", config).result()
+        assert pool.submit(os.getpid).result() != os.getpid()
+
+    assert data == expected == serialize("auto", "recursive", config)
+    assert b"&id001" in data
+
+
+def test_build_with_worker_processes(tmp_path, monkeypatch):
+    """Test that builds parsing and dumping in workers write the same outputs and errors."""
+    monkeypatch.setattr("pydantic_config_builder.builder.MIN_PROCESS_BYTES", 0)
+    (tmp_path / "base.yaml").write_text("b10: {x: 1}\nb9: 2\nshared: &a {k: v}\nalias: *a\n")
+    (tmp_path / "overlay.yaml").write_text("b9: 3\n")
+    config = ConfigModel(
+        builds={
+            "base": BuildConfig(input=["base.yaml"], output=["base-out.yaml"]),
+            "env": BuildConfig(input=["base-out.yaml", "overlay.yaml"], output=["env.yaml"]),
+        }
+    )
+    ConfigBuilder(config=config, base_dir=tmp_path).build_all()
+    sequential = {p: p.read_bytes() for p in tmp_path.glob("*.yaml")}
+    (tmp_path / "env.yaml").unlink()
+
+    builder = ConfigBuilder(config=config, base_dir=tmp_path, options=BuildOptions(jobs=2))
+    builder.build_all()
+    assert {p: p.read_bytes() for p in tmp_path.glob("*.yaml")} == sequential
+    assert builder.check() == []
+
+    (tmp_path / "overlay.yaml").write_text("a: [1\n")
+    with pytest.raises(yaml.YAMLError, match="overlay.yaml"):
+        ConfigBuilder(config=config, base_dir=tmp_path, options=BuildOptions(jobs=2)).build_all()
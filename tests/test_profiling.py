@@ -0,0 +1,60 @@
+"""Tests for Profiler."""
+import yaml
+
+from pydantic_config_builder.builder import ConfigBuilder
+from pydantic_config_builder.config import BuildConfig, ConfigModel
+from pydantic_config_builder.profiling import PhaseEvent, Profiler
+
+
+def test_phase_records_event():
+    """Test that a phase is recorded with its name and byte count."""
+    profiler = Profiler()
+    with profiler.phase("parse", "a.yaml") as span:
+        span.nbytes = 10
+
+    [event] = profiler.events
+    assert (event.phase, event.name, event.nbytes) == ("parse", "a.yaml", 10)
+    assert event.duration >= 0
+    assert profiler.bytes_read() == 10
+
+
+def test_slowest():
+    """Test ranking of files and groups by total time."""
+    profiler = Profiler()
+    for phase, name, duration in [
+        ("parse", "a.yaml", 0.1),
+        ("parse", "b.yaml", 0.3),
+        ("merge", "g1", 0.2),
+        ("dump", "g1", 0.2),
+        ("write", "g2", 0.3),
+    ]:
+        profiler.record(PhaseEvent(phase, name, 0.0, duration, 0))
+
+    assert [name for name, _ in profiler.slowest_files()] == ["b.yaml", "a.yaml"]
+    assert [name for name, _ in profiler.slowest_groups(1)] == ["g1"]
+    assert "Slowest files:" in profiler.summary()
+
+
+def test_builder_phases(tmp_path):
+    """Test that the builder reports each phase to the profiler."""
+    (tmp_path / "base.yaml").write_text(yaml.dump({"a": 1}))
+    (tmp_path / "dev.yaml").write_text(yaml.dump({"b": 2}))
+    config = ConfigModel(
+        builds={
+            "base": BuildConfig(input=["base.yaml"], output=["out/base.yaml"]),
+            "dev": BuildConfig(input=["out/base.yaml", "dev.yaml"], output=["out/dev.yaml"]),
+        }
+    )
+    profiler = Profiler()
+    ConfigBuilder(config, tmp_path, profiler=profiler).build_all()
+
+    phases = [(e.phase, e.name) for e in profiler.events]
+    assert ("resolve", "") in phases
+    assert ("parse", str(tmp_path / "dev.yaml")) in phases
+    for phase in ("merge", "sort", "dump", "write"):
+        assert (phase, "base") in phases
+        assert (phase, "dev") in phases
+    assert profiler.bytes_read() == len("a: 1\n") + len("b: 2\n")
+    assert profiler.bytes_written() == sum(
+        (tmp_path / "out" / name).stat().st_size for name in ("base.yaml", "dev.yaml")
+    )
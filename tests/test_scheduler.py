@@ -0,0 +1,86 @@
+"""Tests for group scheduling."""
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from pydantic_config_builder.config import BuildConfig, ConfigModel
+from pydantic_config_builder.plan import BuildPlan
+from pydantic_config_builder.scheduler import run_in_dependency_order, topological_order
+
+
+def make_plan(builds):
+    """Create a plan from a mapping of group name to (inputs, outputs)."""
+    config = ConfigModel(
+        builds={
+            name: BuildConfig(input=inputs, output=outputs)
+            for name, (inputs, outputs) in builds.items()
+        }
+    )
+    return BuildPlan.from_config(config, Path("/base/dir"))
+
+
+def test_topological_order():
+    """Test that dependencies come first and independent groups keep their order."""
+    plan = make_plan(
+        {
+            "production": (["default.yaml"], ["prod.yaml"]),
+            "other": (["other.yaml"], ["other-out.yaml"]),
+            "development": (["base.yaml"], ["default.yaml"]),
+        }
+    )
+
+    assert topological_order(plan) == ["development", "production", "other"]
+
+
+def test_topological_order_cycle():
+    """Test error on circular dependencies."""
+    plan = make_plan({"a": (["b.yaml"], ["a.yaml"]), "b": (["a.yaml"], ["b.yaml"])})
+
+    with pytest.raises(ValueError, match="Circular dependency"):
+        topological_order(plan)
+
+
+def test_run_parallel():
+    """Test that groups run concurrently but only after their dependencies."""
+    plan = make_plan(
+        {
+            "base": (["base.yaml"], ["default.yaml"]),
+            "a": (["default.yaml"], ["a.yaml"]),
+            "b": (["default.yaml"], ["b.yaml"]),
+            "c": (["a.yaml", "b.yaml"], ["c.yaml"]),
+        }
+    )
+    finished = []
+    lock = threading.Lock()
+    active = []
+
+    def task(name):
+        with lock:
+            active.append(name)
+            for dep in plan.dependencies[name]:
+                assert dep in finished
+        time.sleep(0.05)
+        with lock:
+            finished.append(name)
+
+    run_in_dependency_order(plan, task, jobs=4)
+
+    assert sorted(finished) == ["a", "b", "base", "c"]
+    assert finished[0] == "base"
+    assert finished[-1] == "c"
+
+
+def test_run_error():
+    """Test that a failing task stops dependent groups and re-raises."""
+    plan = make_plan({"a": (["x.yaml"], ["a.yaml"]), "b": (["a.yaml"], ["b.yaml"])})
+    ran = []
+
+    def task(name):
+        ran.append(name)
+        raise RuntimeError(name)
+
+    with pytest.raises(RuntimeError, match="a"):
+        run_in_dependency_order(plan, task, jobs=2)
+    assert ran == ["a"]
@@ -0,0 +1,139 @@
+"""Tests for the build server."""
+import socket
+import sys
+import threading
+import time
+
+import pytest
+import yaml
+
+from pydantic_config_builder.builder import ConfigBuilder
+from pydantic_config_builder.client import BuildClient, ServerError
+from pydantic_config_builder.config import BuildConfig, ConfigModel
+from pydantic_config_builder.server import BuildServer
+
+requires_unix_sockets = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX") or sys.platform == "win32", reason="needs Unix sockets"
+)
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Create a server for a chain of two groups built from a glob."""
+    (tmp_path / "base").mkdir()
+    (tmp_path / "base" / "a.yaml").write_text(yaml.dump({"a": 1}))
+    (tmp_path / "prod.yaml").write_text(yaml.dump({"env": "prod"}))
+    config = ConfigModel(
+        builds={
+            "default": BuildConfig(input=["base/*.yaml"], output=["out/default.yaml"]),
+            "production": BuildConfig(
+                input=["out/default.yaml", "prod.yaml"], output=["out/prod.yaml"]
+            ),
+        }
+    )
+    builder = ConfigBuilder(config=config, base_dir=tmp_path)
+    return BuildServer(builder, tmp_path / "server.sock")
+
+
+def test_get_and_build(server, tmp_path):
+    """Test getting merged configurations and building groups."""
+    response = server.handle({"command": "get", "output": "out/prod.yaml"})
+    assert response == {"ok": True, "config": {"a": 1, "env": "prod"}}
+    assert not (tmp_path / "out").exists()
+
+    response = server.handle({"command": "build", "groups": ["production"]})
+    assert response["written"] == [str(tmp_path / "out" / "prod.yaml")]
+    assert yaml.safe_load((tmp_path / "out" / "prod.yaml").read_text()) == {"a": 1, "env": "prod"}
+
+    response = server.handle({"command": "get", "output": "out/prod.yaml", "format": "yaml"})
+    assert response["config"] == (tmp_path / "out" / "prod.yaml").read_text()
+
+
+def test_invalidates_changed_sources(server, tmp_path):
+    """Test that changed and added sources are picked up by the next request."""
+    server.handle({"command": "build"})
+    misses = server.builder.source_cache.misses
+
+    response = server.handle({"command": "get", "output": "out/prod.yaml"})
+    assert response["config"] == {"a": 1, "env": "prod"}
+    assert server.builder.source_cache.misses == misses
+
+    (tmp_path / "prod.yaml").write_text(yaml.dump({"env": "production"}))
+    response = server.handle({"command": "get", "output": "out/prod.yaml"})
+    assert response["config"] == {"a": 1, "env": "production"}
+
+    (tmp_path / "base" / "b.yaml").write_text(yaml.dump({"b": 2}))
+    response = server.handle({"command": "get", "output": "out/prod.yaml"})
+    assert response["config"] == {"a": 1, "b": 2, "env": "production"}
+
+
+def test_reloads_config(server, tmp_path):
+    """Test that a changed configuration file is reloaded."""
+    config_path = tmp_path / "pydantic-config-builder.yaml"
+    config_path.write_text("first")
+    configs = [ConfigModel(builds={"only": BuildConfig(input=["prod.yaml"], output=["o.yaml"])})]
+    server.config_path = config_path
+    server.reload_config = configs.pop
+
+    assert server.handle({"command": "build", "groups": ["default"]})["ok"]
+    config_path.write_text("second")
+
+    assert server.handle({"command": "build"})["written"] == [str(tmp_path / "o.yaml")]
+    assert server.handle({"command": "build", "groups": ["default"]}) == {
+        "ok": False,
+        "error": "Unknown groups: default",
+    }
+
+
+def test_errors(server):
+    """Test that failing requests return errors."""
+    assert server.handle({"command": "launch"}) == {"ok": False, "error": "Unknown command: launch"}
+    response = server.handle({"command": "get", "output": "nope.yaml"})
+    assert not response["ok"]
+    assert "Not an output" in response["error"]
+
+
+@requires_unix_sockets
+def test_serve_over_socket(server, tmp_path):
+    """Test requests from a client over the Unix socket until shutdown."""
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        deadline = time.monotonic() + 5
+        while not server.socket_path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        client = BuildClient(server.socket_path, timeout=5)
+
+        assert client.build(["default"])["written"] == [str(tmp_path / "out" / "default.yaml")]
+        assert client.get("out/prod.yaml") == {"a": 1, "env": "prod"}
+        assert client.stats()["source_cache"]["misses"] == 2
+        with pytest.raises(ServerError, match="Unknown groups"):
+            client.build(["missing"])
+    finally:
+        BuildClient(server.socket_path, timeout=5).shutdown()
+        thread.join(5)
+    assert not thread.is_alive()
+    assert not server.socket_path.exists()
+
+
+@requires_unix_sockets
+def test_serve_socket_in_use(server, tmp_path):
+    """Test that a stale socket is replaced but a live server's socket is not."""
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(server.socket_path))
+    stale.close()
+
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        deadline = time.monotonic() + 5
+        while server._server is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        second = BuildServer(server.builder, server.socket_path)
+        with pytest.raises(FileExistsError, match="Server already running"):
+            second.serve_forever()
+        assert BuildClient(server.socket_path, timeout=5).stats()["groups"] == 2
+    finally:
+        BuildClient(server.socket_path, timeout=5).shutdown()
+        thread.join(5)
+    assert not thread.is_alive()
@@ -0,0 +1,74 @@
+"""Tests for key ordering."""
+import itertools
+from typing import Any, List
+
+import pytest
+
+from pydantic_config_builder.sorting import KeySorter, compact_sort_key, natural_sort_key
+
+KEYS = ["item10", "Item2", "item1", "item", "item01a", 3, "b", "a.b"]
+
+
+def test_natural_sort_key():
+    """Test that numbers in keys are compared by value, ignoring case."""
+    assert sorted(KEYS, key=natural_sort_key) == [
+        3,
+        "a.b",
+        "b",
+        "item1",
+        "item01a",
+        "Item2",
+        "item10",
+        "item",
+    ]
+
+
+def test_compact_sort_key_matches_natural_sort_key():
+    """Test that compact keys compare exactly like natural sort keys."""
+    chars = ["a", "B", "0", "1", "9", ".", "\0", "\1", "Σ"]
+    keys: List[Any] = ["".join(p) for n in range(4) for p in itertools.product(chars, repeat=n)]
+    keys += ["007", "7", "x" + "9" * 30, "x" + "1" + "0" * 30, 1, 1.5, True, None]
+
+    natural = {repr(key): natural_sort_key(key) for key in keys}
+    compact = {repr(key): compact_sort_key(key) for key in keys}
+
+    for a, b in itertools.product(keys[::7] + keys[-8:], keys):
+        na, nb, ca, cb = natural[repr(a)], natural[repr(b)], compact[repr(a)], compact[repr(b)]
+        assert ((na > nb) - (na < nb)) == ((ca > cb) - (ca < cb)), (a, b)
+
+
+def test_sorter_modes():
+    """Test top-level, recursive and merged key order."""
+    data = {"b10": {"z": 1, "a": [{"y": 1, "x": 2}]}, "b9": 1}
+
+    assert list(KeySorter().sort(data)) == ["b9", "b10"]
+    assert list(KeySorter().sort(data)["b10"]) == ["z", "a"]
+    assert KeySorter("none").sort(data) is data
+
+    nested = KeySorter("recursive").sort(data)
+    assert list(nested) == ["b9", "b10"]
+    assert list(nested["b10"]) == ["a", "z"]
+    assert list(nested["b10"]["a"][0]) == ["x", "y"]
+    assert nested == data
+
+
+def test_sorter_recursive_keeps_shared_values():
+    """Test that values occurring twice are still one object after sorting."""
+    shared = {"b": 1, "a": 2}
+    result = KeySorter("recursive").sort({"x": shared, "y": shared})
+    assert result["x"] is result["y"]
+    assert list(result["x"]) == ["a", "b"]
+
+
+def test_sorter_caches_string_keys():
+    """Test that sort keys of strings are computed once."""
+    sorter = KeySorter()
+    sorter.keys({"a1": 1, "a2": 2, 1: 3})
+    assert sorter.keys({"a2": 1, "a1": 2}) == ["a1", "a2"]
+    assert sorter._keys == {"a1": compact_sort_key("a1"), "a2": compact_sort_key("a2")}
+
+
+def test_sorter_unknown_mode():
+    """Test error for unknown sort mode."""
+    with pytest.raises(ValueError, match="Unknown key sort mode"):
+        KeySorter("alphabetical")
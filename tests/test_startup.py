@@ -0,0 +1,54 @@
+"""Tests for command line startup cost."""
+import subprocess
+import sys
+from pathlib import Path
+
+# Packages the command line must not import unless it builds
+HEAVY_MODULES = ("pydantic", "yaml", "pydantic_config_builder.builder")
+
+# Cumulative import time budget for pydantic_config_builder.cli, in microseconds.
+# Importing it eagerly with pydantic and yaml took well over this.
+IMPORT_BUDGET_US = 200_000
+
+CHECKOUT = Path(__file__).parent.parent
+
+
+def import_times(*args):
+    """Run Python with -X importtime and get cumulative import time per module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args], cwd=CHECKOUT, capture_output=True, text=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:") :].split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_import_is_light():
+    """Test that importing the command line does not import heavy modules."""
+    times = import_times("-c", "import pydantic_config_builder.cli")
+
+    assert "pydantic_config_builder.cli" in times
+    assert not [name for name in HEAVY_MODULES if name in times]
+    assert times["pydantic_config_builder.cli"] < IMPORT_BUDGET_US
+
+
+def test_help_is_light():
+    """Test that --help does not import heavy modules."""
+    times = import_times("-m", "pydantic_config_builder.cli", "-h")
+
+    assert "click" in times
+    assert not [name for name in HEAVY_MODULES if name in times]
+
+
+def test_connect_is_light(tmp_path):
+    """Test that building through a server does not import heavy modules."""
+    times = import_times(
+        "-m", "pydantic_config_builder.cli", "--connect", str(tmp_path / "missing.sock")
+    )
+
+    assert "pydantic_config_builder.client" in times
+    assert not [name for name in HEAVY_MODULES if name in times]
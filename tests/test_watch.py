@@ -0,0 +1,102 @@
+"""Tests for watch mode."""
+import sys
+import threading
+import time
+
+import pytest
+import yaml
+
+from pydantic_config_builder.builder import ConfigBuilder
+from pydantic_config_builder.config import BuildConfig, ConfigModel
+from pydantic_config_builder.watch import InotifyWatcher, watch
+
+
+def wait_for(condition, timeout=5.0):
+    """Wait until condition() is true."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out waiting for condition")
+        time.sleep(0.02)
+
+
+def load(path):
+    """Load a YAML file, None if it does not exist yet."""
+    return yaml.safe_load(path.read_text()) if path.exists() else None
+
+
+@pytest.fixture(params=["polling", "inotify"])
+def use_inotify(request):
+    """Run watch tests with both watcher implementations."""
+    if request.param == "inotify":
+        if not sys.platform.startswith("linux"):
+            pytest.skip("inotify is only available on Linux")
+        InotifyWatcher().close()
+        return True
+    return False
+
+
+def test_watch_rebuilds_affected_groups(tmp_path, use_inotify):
+    """Test that changes rebuild only affected groups and their dependents."""
+    (tmp_path / "base").mkdir()
+    (tmp_path / "base" / "a.yaml").write_text(yaml.dump({"a": 1}))
+    (tmp_path / "other.yaml").write_text(yaml.dump({"o": 1}))
+    config = ConfigModel(
+        builds={
+            "default": BuildConfig(input=["base/*.yaml"], output=["default.yaml"]),
+            "production": BuildConfig(input=["default.yaml"], output=["prod.yaml"]),
+            "other": BuildConfig(input=["other.yaml"], output=["other-out.yaml"]),
+        }
+    )
+    builder = ConfigBuilder(config=config, base_dir=tmp_path)
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=watch,
+        kwargs={
+            "builder": builder,
+            "poll_interval": 0.05,
+            "debounce": 0.05,
+            "use_inotify": use_inotify,
+            "stop": stop,
+        },
+    )
+    thread.start()
+    try:
+        wait_for(lambda: load(tmp_path / "prod.yaml") == {"a": 1})
+        other_mtime = (tmp_path / "other-out.yaml").stat().st_mtime_ns
+
+        # Changed source
+        (tmp_path / "base" / "a.yaml").write_text(yaml.dump({"a": 2}))
+        wait_for(lambda: load(tmp_path / "prod.yaml") == {"a": 2})
+
+        # New file matching a glob
+        (tmp_path / "base" / "b.yaml").write_text(yaml.dump({"b": 1}))
+        wait_for(lambda: load(tmp_path / "prod.yaml") == {"a": 2, "b": 1})
+    finally:
+        stop.set()
+        thread.join()
+
+    assert builder.rebuilt_outputs == [tmp_path / "default.yaml", tmp_path / "prod.yaml"]
+    assert (tmp_path / "other-out.yaml").stat().st_mtime_ns == other_mtime
+
+
+def test_watch_recovers_from_errors(tmp_path, capsys):
+    """Test that a broken source is reported and rebuilt once fixed."""
+    (tmp_path / "a.yaml").write_text(yaml.dump({"a": 1}))
+    config = ConfigModel(builds={"test": BuildConfig(input=["a.yaml"], output=["out.yaml"])})
+    builder = ConfigBuilder(config=config, base_dir=tmp_path)
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=watch,
+        kwargs={"builder": builder, "poll_interval": 0.05, "debounce": 0.05, "stop": stop},
+    )
+    thread.start()
+    try:
+        wait_for(lambda: load(tmp_path / "out.yaml") == {"a": 1})
+        (tmp_path / "a.yaml").write_text("a: [unclosed\n")
+        wait_for(lambda: "Build failed" in capsys.readouterr().out)
+        (tmp_path / "a.yaml").write_text(yaml.dump({"a": 3}))
+        wait_for(lambda: load(tmp_path / "out.yaml") == {"a": 3})
+    finally:
+        stop.set()
+        thread.join()
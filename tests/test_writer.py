@@ -0,0 +1,102 @@
+"""Tests for output writing."""
+import os
+
+import pytest
+
+from pydantic_config_builder.writer import has_chunks, write_if_changed, write_stream_if_changed
+
+
+def test_write_new_file(tmp_path):
+    """Test writing a file that does not exist, creating its directory."""
+    path = tmp_path / "build" / "output.yaml"
+
+    assert write_if_changed(path, b"a: 1\n")
+    assert path.read_bytes() == b"a: 1\n"
+    assert [p.name for p in path.parent.iterdir()] == ["output.yaml"]
+
+
+def test_skip_identical_content(tmp_path):
+    """Test that a file with identical content is not rewritten."""
+    path = tmp_path / "output.yaml"
+    path.write_bytes(b"a: 1\n")
+    os.utime(path, ns=(0, 0))
+
+    assert not write_if_changed(path, b"a: 1\n")
+    assert path.stat().st_mtime_ns == 0
+
+
+def test_replace_changed_content(tmp_path):
+    """Test that changed content replaces the file and keeps its permissions."""
+    path = tmp_path / "output.yaml"
+    path.write_bytes(b"a: 1\n")
+    path.chmod(0o640)
+
+    assert write_if_changed(path, b"a: 2\n")
+    assert path.read_bytes() == b"a: 2\n"
+    assert path.stat().st_mode & 0o777 == 0o640
+
+
+def test_write_through_symlink(tmp_path):
+    """Test that a symlinked output updates the link target."""
+    target = tmp_path / "target.yaml"
+    target.write_bytes(b"a: 1\n")
+    link = tmp_path / "link.yaml"
+    link.symlink_to(target)
+
+    assert write_if_changed(link, b"a: 2\n")
+    assert link.is_symlink()
+    assert target.read_bytes() == b"a: 2\n"
+
+
+def test_stream_write(tmp_path):
+    """Test writing chunks to a new file and skipping identical content."""
+    path = tmp_path / "build" / "output.yaml"
+
+    assert write_stream_if_changed(path, [b"a: 1\n", b"b: 2\n"])
+    assert path.read_bytes() == b"a: 1\nb: 2\n"
+
+    os.utime(path, ns=(0, 0))
+    os.utime(path.parent, ns=(0, 0))
+    assert not write_stream_if_changed(path, iter([b"a: 1\n", b"b: 2\n"]))
+    assert path.stat().st_mtime_ns == 0
+    # No temporary file was created, so watchers of the directory are not woken
+    assert path.parent.stat().st_mtime_ns == 0
+    assert [p.name for p in path.parent.iterdir()] == ["output.yaml"]
+
+
+def test_has_chunks(tmp_path):
+    """Test comparing a file with chunks without writing it."""
+    path = tmp_path / "output.yaml"
+    assert not has_chunks(path, [b"a: 1\n"])
+
+    path.write_bytes(b"a: 1\nb: 2\n")
+    assert has_chunks(path, [b"a: 1\n", b"b: 2\n"])
+    for chunks in ([b"a: 1\n"], [b"a: 1\n", b"b: 3\n"], [b"a: 1\n", b"b: 2\n", b"c: 3\n"]):
+        assert not has_chunks(path, chunks)
+
+
+def test_stream_write_changed(tmp_path):
+    """Test that shorter, longer and changed content replaces the file."""
+    path = tmp_path / "output.yaml"
+    path.write_bytes(b"a: 1\nb: 2\n")
+    path.chmod(0o640)
+
+    for chunks in ([b"a: 1\n"], [b"a: 1\n", b"b: 2\n", b"c: 3\n"], [b"a: 1\n", b"b: 3\n"]):
+        assert write_stream_if_changed(path, chunks)
+        assert path.read_bytes() == b"".join(chunks)
+        assert path.stat().st_mode & 0o777 == 0o640
+
+
+def test_stream_write_error(tmp_path):
+    """Test that a failing chunk source leaves the file and no temporary file."""
+    path = tmp_path / "output.yaml"
+    path.write_bytes(b"a: 1\n")
+
+    def chunks():
+        yield b"a: 2\n"
+        raise RuntimeError("serialization failed")
+
+    with pytest.raises(RuntimeError):
+        write_stream_if_changed(path, chunks())
+    assert path.read_bytes() == b"a: 1\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["output.yaml"]
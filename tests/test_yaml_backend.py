@@ -0,0 +1,136 @@
+"""Tests for YAML backends."""
+import datetime
+import random
+
+import pytest
+import yaml
+
+from pydantic_config_builder.yaml_backend import HAS_LIBYAML, YamlBackend, is_c_safe
+
+requires_libyaml = pytest.mark.skipif(not HAS_LIBYAML, reason="PyYAML built without libyaml")
+
+EDGE_CASES = [
+    {"": "empty key"},
+    {"multi\nline": "key"},
+    {"é" * 100: "key longer than 127 bytes but shorter than 128 characters"},
+    {"a" * 123: "key written as a complex key by Python only, counting its tag"},
+    {int("1" * 123): "integer key written as a complex key by Python only"},
+    {"emoji": "\U0001f600"},
+    {"nbsp": "a\xa0b"},
+    {"nel": "a\x85b"},
+    {"bom": "﻿a"},
+    {"separator": "a b"},
+    {"control": "a\x07b\r"},
+]
+
+
+def random_string(rng, length):
+    """Generate a string mixing YAML indicators, whitespace and unicode."""
+    alphabet = list("abc xyz:#-?,[]{}&*!|>'\"%@`\n\t\\0123.eE+~") + ["é", "日", "\x85", "\xa0"]
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, length)))
+
+
+def random_value(rng, depth=0):
+    """Generate a random YAML-safe value."""
+    r = rng.random()
+    if depth > 3 or r < 0.4:
+        return rng.choice(
+            [
+                random_string(rng, 20),
+                random_string(rng, 150),
+                rng.randint(-(10**20), 10**20),
+                rng.random() * 1e10,
+                None,
+                True,
+                datetime.date(2001, 2, 3),
+                b"\x00abc" * rng.randint(0, 30),
+                float("inf"),
+            ]
+        )
+    if r < 0.7:
+        return {
+            random_string(rng, rng.choice([5, 140])): random_value(rng, depth + 1)
+            for _ in range(rng.randint(0, 4))
+        }
+    return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+
+
+def test_unknown_backend():
+    """Test error for an unknown backend name."""
+    with pytest.raises(ValueError):
+        YamlBackend("rust")
+
+
+@pytest.mark.parametrize("data", EDGE_CASES)
+def test_edge_cases_not_c_safe(data):
+    """Test that data libyaml writes differently is detected."""
+    assert not is_c_safe(data)
+
+
+@requires_libyaml
+@pytest.mark.parametrize("data", EDGE_CASES)
+def test_edge_cases_identical(data):
+    """Test that both backends write edge cases identically."""
+    assert YamlBackend("c").dump(data) == YamlBackend("python").dump(data)
+
+
+@requires_libyaml
+@pytest.mark.parametrize("length", [121, 122])
+def test_longest_simple_key_c_safe(length):
+    """Test that keys up to the shared simple key limit are written by libyaml identically."""
+    for data in [{"a" * length: 1}, {int("1" * length): 1}]:
+        assert is_c_safe(data)
+        assert YamlBackend("c").dump(data) == YamlBackend("python").dump(data)
+
+
+@requires_libyaml
+def test_random_data_identical():
+    """Test that both backends write random data byte-identically."""
+    rng = random.Random(0)
+    checked = 0
+    for _ in range(500):
+        data = {random_string(rng, 8): random_value(rng) for _ in range(rng.randint(0, 3))}
+        c_output = YamlBackend("c").dump(data)
+        assert c_output == YamlBackend("python").dump(data)
+        assert yaml.load(c_output, Loader=yaml.CSafeLoader) == yaml.safe_load(c_output)
+        checked += is_c_safe(data)
+    # Make sure the libyaml emitter itself was exercised
+    assert checked > 100
+
+
+@requires_libyaml
+def test_load_identical(tmp_path):
+    """Test that both backends load files identically."""
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        "base: &base\n  host: localhost\n  ports: [1, 2]\n"
+        "derived:\n  <<: *base\n  host: example.com\n"
+        "date: 2024-02-10\nempty:\n"
+    )
+
+    assert YamlBackend("c").load(path) == YamlBackend("python").load(path)
+
+
+@pytest.mark.parametrize("name", ["python", pytest.param("c", marks=requires_libyaml)])
+def test_dump_items_identical(name):
+    """Test that chunks written one entry at a time join to the full document."""
+    backend = YamlBackend(name)
+    rng = random.Random(1)
+    for _ in range(200):
+        data = {random_string(rng, 8): random_value(rng) for _ in range(rng.randint(0, 5))}
+        keys = list(data)
+        rng.shuffle(keys)
+        expected = backend.dump({key: data[key] for key in keys})
+        assert b"".join(backend.dump_items(data, keys)) == expected
+
+
+def test_dump_items_shared_values():
+    """Test that shared values are written with anchors spanning entries."""
+    shared = {"host": "localhost"}
+    data = {"a": shared, "b": shared, "c": {"d": [1]}}
+    backend = YamlBackend()
+
+    chunks = list(backend.dump_items(data, ["c", "a", "b"]))
+    assert len(chunks) == 1
+    assert chunks[0] == backend.dump({"c": data["c"], "a": shared, "b": shared})
+    assert len(list(backend.dump_items({"a": 1, "b": [1]}, ["a", "b"]))) == 2